@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Shared boto3 session and client configuration for the deployment scripts.
+
+All deploy scripts create their AWS clients from the same Session and botocore
+Config so that HTTP connections (and their TLS sessions) are pooled and reused
+across the many small Cognito, SSM, STS and AgentCore control-plane calls.
+"""
+
+import functools
+import os
+
+import boto3
+from botocore.config import Config
+
+SESSION = boto3.Session()
+
+CFG = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=5,
+    read_timeout=60
+)
+
+
+def client(service_name: str, region_name: str = None):
+    """
+    Return a pooled client for the given service, created once per process.
+
+    The region defaults to region(), and is resolved before the cache lookup so
+    client('ssm') and client('ssm', region()) share one client. boto3 clients
+    are thread-safe, so the same instance can be shared by every caller
+    (including ThreadPoolExecutor workers).
+    """
+    return _client(service_name, region_name or region())
+
+
+@functools.lru_cache(maxsize=None)
+def _client(service_name: str, region_name: str):
+    return SESSION.client(service_name, region_name=region_name, config=CFG)
+
+
+@functools.lru_cache(maxsize=1)
+def account_id() -> str:
+    """Return the caller's AWS account id (one STS round trip per process)."""
+    return client('sts').get_caller_identity()['Account']
+
+
+@functools.lru_cache(maxsize=1)
+def region() -> str:
+    """
+    Return the deployment region.
+
+    AWS_REGION / AWS_DEFAULT_REGION are checked first so the common case does
+    not depend on the session's config-file lookup.
+    """
+    return (
+        os.environ.get('AWS_REGION')
+        or os.environ.get('AWS_DEFAULT_REGION')
+        or SESSION.region_name
+    )
@@ -1,75 +1,126 @@
+import hashlib
+import io
+import logging
 import os
-import boto3
+import sys
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-boto_session = boto3.Session()
-region = boto_session.region_name
+from botocore.config import Config
 
+import aws_clients
 import utils
 
+logging.basicConfig(format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
+
+region = aws_clients.region()
+
 #### Create ZIP file dynamically from lambda_function.py
+LAMBDA_ZIP_FILES = ['lambda_function.py', 'requirements.txt', 'utils.py']
+# Extensões que já estão comprimidas e vão para o ZIP sem recompressão
+STORED_SUFFIXES = {'.whl', '.zip', '.gz', '.png', '.jpg'}
+
+def _lambda_sources_digest(files):
+    """
+    Calcula um hash do conteúdo dos arquivos que vão para o ZIP
+    """
+    h = hashlib.blake2b()
+    for file in sorted(files):
+        h.update(file.encode())
+        with open(file, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def _add_to_zip(zipf, path):
+    """
+    Adiciona um arquivo ao ZIP, sem recomprimir conteúdo já comprimido
+    """
+    if os.path.splitext(path)[1].lower() in STORED_SUFFIXES:
+        zipf.write(path, path, compress_type=zipfile.ZIP_STORED)
+    else:
+        zipf.write(path, path, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+
 def create_lambda_zip():
     """
-    Cria lambda_function_code.zip com o código da Lambda
+    Cria o ZIP com o código da Lambda em memória e retorna os bytes
+
+    O ZIP só é recriado quando o conteúdo dos arquivos muda; a última versão
+    fica em lambda_function_code.zip e o hash dela em lambda_function_code.zip.sha.
     """
     zip_filename = 'lambda_function_code.zip'
+    digest_filename = f"{zip_filename}.sha"
+    
+    # Um único scandir no lugar de um stat() por arquivo
+    entries = {entry.name: entry for entry in os.scandir('.') if entry.is_file()}
+    
+    if 'lambda_function.py' not in entries:
+        raise FileNotFoundError("❌ Arquivo lambda_function.py não encontrado!")
+    files = [file for file in LAMBDA_ZIP_FILES if file in entries]
+    
+    # Atalho: se o ZIP é mais novo que todos os fontes, nem calcula o hash
+    if zip_filename in entries and digest_filename in entries:
+        zip_mtime = entries[zip_filename].stat().st_mtime
+        if zip_mtime >= max(entries[file].stat().st_mtime for file in files):
+            logger.info("♻️ %s mais novo que os fontes, reutilizando", zip_filename)
+            with open(zip_filename, 'rb') as zf:
+                return zf.read()
+    
+    digest = _lambda_sources_digest(files)
+    
+    # Reutilizar ZIP existente se o código não mudou
+    if zip_filename in entries and digest_filename in entries:
+        with open(digest_filename) as f:
+            if f.read().strip() == digest:
+                logger.info("♻️ %s já está atualizado, reutilizando", zip_filename)
+                with open(zip_filename, 'rb') as zf:
+                    return zf.read()
     
-    # Remover ZIP existente se houver
-    if os.path.exists(zip_filename):
-        os.remove(zip_filename)
-        print(f"🗑️ {zip_filename} existente removido")
+    # compresslevel=1: para arquivos de texto pequenos o ganho do nível
+    # padrão (6) é mínimo e a compressão fica bem mais lenta
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+        for file in files:
+            _add_to_zip(zipf, file)
+            logger.info("✅ %s adicionado ao ZIP", file)
+    zip_bytes = buf.getvalue()
     
+    # Salvar cópia em disco apenas para reaproveitar no próximo deploy
     try:
-        with zipfile.ZipFile(zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Adicionar lambda_function.py ao ZIP
-            if os.path.exists('lambda_function.py'):
-                zipf.write('lambda_function.py', 'lambda_function.py')
-                print("✅ lambda_function.py adicionado ao ZIP")
-            else:
-                raise FileNotFoundError("❌ Arquivo lambda_function.py não encontrado!")
-            
-            # Adicionar outros arquivos necessários se existirem
-            additional_files = ['requirements.txt', 'utils.py']
-            for file in additional_files:
-                if os.path.exists(file):
-                    zipf.write(file, file)
-                    print(f"✅ {file} adicionado ao ZIP")
-        
-        print(f"📦 ZIP criado: {zip_filename}")
-        return zip_filename
-        
-    except Exception as e:
-        # Limpar arquivo em caso de erro
-        if os.path.exists(zip_filename):
-            os.remove(zip_filename)
-        raise e
+        with open(zip_filename, 'wb') as f:
+            f.write(zip_bytes)
+        with open(digest_filename, 'w') as f:
+            f.write(digest)
+    except OSError as e:
+        logger.warning("⚠️ Não foi possível salvar %s: %s", zip_filename, e)
+    
+    logger.info("📦 ZIP criado: %s (%s bytes)", zip_filename, len(zip_bytes))
+    return zip_bytes
 
 # Criar ZIP dinamicamente
-print("🚀 Criando lambda_function_code.zip dinamicamente...")
-lambda_zip_path = create_lambda_zip()
+logger.info("🚀 Criando ZIP da Lambda dinamicamente...")
+lambda_zip_bytes = create_lambda_zip()
 
 #### Create AWS Lambda function using the dynamically created ZIP
-lambda_resp = utils.create_gateway_lambda(lambda_zip_path)
+lambda_resp = utils.create_gateway_lambda(lambda_zip_bytes)
 
 if lambda_resp is not None:
     if lambda_resp['exit_code'] == 0:
-        print("Lambda function created with ARN: ", lambda_resp['lambda_function_arn'])
+        logger.info("Lambda function created with ARN: %s", lambda_resp['lambda_function_arn'])
     else:
-        print("Lambda function creation failed with message: ", lambda_resp['lambda_function_arn'])
+        logger.error("Lambda function creation failed with message: %s", lambda_resp['lambda_function_arn'])
 
 
 lambda_arn =  lambda_resp['lambda_function_arn']
 #### Create an IAM role for the Gateway to assume
 agentcore_gateway_iam_role = utils.create_agentcore_gateway_role("agentcore-lambdagateway")
-print("Agentcore gateway role ARN: ", agentcore_gateway_iam_role['Role']['Arn'])
+logger.info("Agentcore gateway role ARN: %s", agentcore_gateway_iam_role['Role']['Arn'])
 
 
 # Creating Cognito User Pool 
-import os
-import boto3
-import requests
-import time
-from botocore.exceptions import ClientError
 
 USER_POOL_NAME = "octank-gateway-pool"
 RESOURCE_SERVER_ID = "octank-gateway-id"
@@ -80,29 +131,46 @@ SCOPES = [
     {"ScopeName": "gateway:write", "ScopeDescription": "Write access"}
 ]
 scopeString = f"{RESOURCE_SERVER_ID}/gateway:read {RESOURCE_SERVER_ID}/gateway:write"
-utils.put_ssm_parameter("/app/octank/agentcore/scope", scopeString)
 
-cognito = boto3.client("cognito-idp", region_name=region)
+cognito = aws_clients.client("cognito-idp", region)
 
-print("Creating or retrieving Cognito resources...")
+logger.info("Creating or retrieving Cognito resources...")
 user_pool_id = utils.get_or_create_user_pool(cognito, USER_POOL_NAME)
-print(f"User Pool ID: {user_pool_id}")
-utils.put_ssm_parameter("/app/octank/agentcore/user_pool_id", user_pool_id)
+logger.info("User Pool ID: %s", user_pool_id)
 
 utils.get_or_create_resource_server(cognito, user_pool_id, RESOURCE_SERVER_ID, RESOURCE_SERVER_NAME, SCOPES)
-print("Resource server ensured.")
+logger.info("Resource server ensured.")
 
 client_id, client_secret  = utils.get_or_create_m2m_client(cognito, user_pool_id, CLIENT_NAME, RESOURCE_SERVER_ID)
-print(f"Client ID: {client_id}")
-utils.put_ssm_parameter("/app/octank/agentcore/client_id", client_id)
-utils.put_ssm_parameter("/app/octank/agentcore/client_secret", client_secret)
+logger.info("Client ID: %s", client_id)
+
+# Publish the Cognito values to SSM in the background; the writes are joined
+# at the end of the script so they overlap with the gateway creation below
+ssm_executor = ThreadPoolExecutor(max_workers=8)
+ssm_writes = utils.submit_ssm_parameters(ssm_executor, {
+    "/app/octank/agentcore/scope": scopeString,
+    "/app/octank/agentcore/user_pool_id": user_pool_id,
+    "/app/octank/agentcore/client_id": client_id,
+    "/app/octank/agentcore/client_secret": client_secret
+})
 
 # Get discovery URL  
 cognito_discovery_url = f'https://cognito-idp.{region}.amazonaws.com/{user_pool_id}/.well-known/openid-configuration'
-print(cognito_discovery_url)
+logger.info("%s", cognito_discovery_url)
 
 # CreateGateway with Cognito authorizer without CMK. Use the Cognito user pool created in the previous step
-gateway_client = boto3.client('bedrock-agentcore-control', region_name = region)
+# Short timeouts and adaptive retries so a conflicting create fails fast
+# instead of waiting out botocore's default 60s read timeout
+gateway_client = aws_clients.SESSION.client(
+    'bedrock-agentcore-control',
+    region_name=region,
+    config=aws_clients.CFG.merge(Config(
+        retries={'max_attempts': 5, 'mode': 'adaptive'},
+        connect_timeout=3,
+        read_timeout=20,
+        max_pool_connections=20
+    ))
+)
 auth_config = {
     "customJWTAuthorizer": { 
         "allowedClients": [client_id],  # Client MUST match with the ClientId configured in Cognito. Example: 7rfbikfsm51j2fpaggacgng84g
@@ -120,19 +188,25 @@ try:
         authorizerConfiguration=auth_config,
         description='AgentCore Gateway with AWS Lambda target type'
     )
-    print(create_response)
+    logger.info("%s", create_response)
     # Retrieve the GatewayID used for GatewayTarget creation
     gatewayID = create_response["gatewayId"]
     gatewayURL = create_response["gatewayUrl"]
-    print(gatewayID)
-    utils.put_ssm_parameter("/app/octank/agentcore/gatewayID", gatewayID)
-    utils.put_ssm_parameter("/app/octank/agentcore/gatewayURL", gatewayURL)
+    logger.info("%s", gatewayID)
+    ssm_writes += utils.submit_ssm_parameters(ssm_executor, {
+        "/app/octank/agentcore/gatewayID": gatewayID,
+        "/app/octank/agentcore/gatewayURL": gatewayURL
+    })
 except gateway_client.exceptions.ConflictException:
-    print(f"Gateway '{gateway_name}' already exists. Using existing gateway.")
-    gatewayID = utils.get_ssm_parameter("/app/octank/agentcore/gatewayID")
-    gatewayURL = utils.get_ssm_parameter("/app/octank/agentcore/gatewayURL")
+    logger.info("Gateway '%s' already exists. Using existing gateway.", gateway_name)
+    gateway_params = utils.get_ssm_parameters([
+        "/app/octank/agentcore/gatewayID",
+        "/app/octank/agentcore/gatewayURL"
+    ])
+    gatewayID = gateway_params["/app/octank/agentcore/gatewayID"]
+    gatewayURL = gateway_params["/app/octank/agentcore/gatewayURL"]
 # Replace the AWS Lambda function ARN below
-print("O ARN é: " + lambda_arn)
+logger.info("O ARN é: %s", lambda_arn)
 #print("O ARN 2 é: " + lambda_resp)
 lambda_target_config = {
     "mcp": {
@@ -142,7 +216,7 @@ lambda_target_config = {
                 "inlinePayload": [
                     {
                         "name": "send_whatsapp_message",
-                        "description": "Envia mensagem de texto WhatsApp via AWS End User Messaging Social. Use esta ferramenta para enviar respostas aos usuários via WhatsApp.",
+                        "description": "Envia mensagem de texto WhatsApp via AWS End User Messaging Social. Use esta ferramenta para enviar respostas aos usuários via WhatsApp. Informe phone_number e message para um destinatário, ou messages para vários de uma vez.",
                         "inputSchema": {
                             "type": "object",
                             "properties": {
@@ -153,9 +227,26 @@ lambda_target_config = {
                                 "message": {
                                     "type": "string",
                                     "description": "Texto da mensagem a ser enviada"
+                                },
+                                "messages": {
+                                    "type": "array",
+                                    "description": "Várias mensagens enviadas em paralelo (substitui phone_number e message)",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "phone_number": {
+                                                "type": "string",
+                                                "description": "Número WhatsApp do destinatário (formato: +5511999999999)"
+                                            },
+                                            "message": {
+                                                "type": "string",
+                                                "description": "Texto da mensagem a ser enviada"
+                                            }
+                                        },
+                                        "required": ["phone_number", "message"]
+                                    }
                                 }
-                            },
-                            "required": ["phone_number", "message"]
+                            }
                         }
                     }
                 ]
@@ -172,11 +263,10 @@ credential_config = [
 ]
 
 # Adicionar timestamp para evitar conflitos de nome
-import time
 timestamp = int(time.time())
 targetname = f'WppLambdaFunction-{timestamp}'
 
-print(f"🎯 Creating gateway target: {targetname}")
+logger.info("🎯 Creating gateway target: %s", targetname)
 
 try:
     response = gateway_client.create_gateway_target(
@@ -186,11 +276,17 @@ try:
         targetConfiguration=lambda_target_config,
         credentialProviderConfigurations=credential_config)
     
-    print(f"✅ Gateway target created successfully: {targetname}")
-    print(response)
+    logger.info("✅ Gateway target created successfully: %s", targetname)
+    logger.info("%s", response)
     
 except gateway_client.exceptions.ConflictException:
-    print(f"⚠️ Target '{targetname}' already exists. Using existing target.")
+    logger.warning("⚠️ Target '%s' already exists. Using existing target.", targetname)
 except Exception as e:
-    print(f"❌ Error creating gateway target: {e}")
-    raise
\ No newline at end of file
+    logger.error("❌ Error creating gateway target: %s", e)
+    raise
+finally:
+    # Wait for the queued SSM writes; result() re-raises the first failure as
+    # soon as it happens rather than after every earlier write has finished
+    for future in as_completed(ssm_writes):
+        future.result()
+    ssm_executor.shutdown()
\ No newline at end of file
@@ -1,7 +1,10 @@
 """Setup script for AgentCore Memory with three standard long-term strategies."""
 
+import logging
+import os
 import sys
-import boto3
+
+import aws_clients
 from bedrock_agentcore_starter_toolkit.operations.memory.manager import MemoryManager
 from bedrock_agentcore_starter_toolkit.operations.memory.models.strategies import (
     SummaryStrategy,
@@ -9,6 +12,10 @@ from bedrock_agentcore_starter_toolkit.operations.memory.models.strategies impor
     SemanticStrategy
 )
 
+logging.basicConfig(format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
 
 def setup_memory(region_name: str = "us-east-1") -> str:
     """Create AgentCore Memory with three standard long-term strategies.
@@ -19,7 +26,7 @@ def setup_memory(region_name: str = "us-east-1") -> str:
     Returns:
         Memory ID
     """
-    print(f"Setting up AgentCore Memory in region {region_name}...")
+    logger.info("Setting up AgentCore Memory in region %s...", region_name)
     
     # Create memory manager
     memory_manager = MemoryManager(region_name=region_name)
@@ -48,22 +55,29 @@ def setup_memory(region_name: str = "us-east-1") -> str:
     )
     
     memory_id = memory.get('id')
-    print(f"\n✅ Memory created successfully!")
-    print(f"Memory ID: {memory_id}")
-    print(f"\nAdd this to your .env file:")
-    print(f"MEMORY_ID={memory_id}")
+    logger.info("\n✅ Memory created successfully!")
+    logger.info("Memory ID: %s", memory_id)
+    logger.info("\nAdd this to your .env file:")
+    logger.info("MEMORY_ID=%s", memory_id)
     
     return memory_id
 
 def store_memory_id_in_ssm(param_name: str, memory_id: str):
+    # Re-runs usually find the same id already stored, so skip the write then
+    try:
+        if ssm.get_parameter(Name=param_name)["Parameter"]["Value"] == memory_id:
+            logger.info("memory_id already up to date in SSM: %s", param_name)
+            return
+    except ssm.exceptions.ParameterNotFound:
+        pass
     ssm.put_parameter(Name=param_name, Value=memory_id, Type="String", Overwrite=True)
-    print(f"Stored memory_id in SSM: {param_name}")
+    logger.info("Stored memory_id in SSM: %s", param_name)
 
 
 if __name__ == "__main__":
     # Get region from command line or use default
     region = sys.argv[1] if len(sys.argv) > 1 else "us-east-1"
-    ssm = boto3.client("ssm")
+    ssm = aws_clients.client("ssm")
     param_name = "/app/octankedu/agentcore/memory_id"
     
     
@@ -72,5 +86,5 @@ if __name__ == "__main__":
         store_memory_id_in_ssm(param_name, memory_id)
 
     except Exception as e:
-        print(f"\n❌ Error setting up memory: {str(e)}")
+        logger.error("\n❌ Error setting up memory: %s", e)
         sys.exit(1)
@@ -10,21 +10,26 @@ with MCP Gateway integration for tool access.
 """
 
 from bedrock_agentcore_starter_toolkit import Runtime
-from boto3.session import Session
+import aws_clients
 import utils
 from dotenv import load_dotenv
+import logging
 import os
+import sys
+
+logging.basicConfig(format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
 
 # Load environment variables from .env file
 load_dotenv()
 
-boto_session = Session()
-region = boto_session.region_name
+region = aws_clients.region()
 agentcore_gateway_iam_role = utils.create_agentcore_role("lambdagateway")
 
-print(f"current region: {region}")
-account_id = boto_session.client("sts").get_caller_identity()["Account"]
-print(f"current account: {account_id}")
+logger.info("current region: %s", region)
+account_id = aws_clients.account_id()
+logger.info("current account: %s", account_id)
 
 # Get MEMORY_ID from environment
 memory_id = os.getenv("MEMORY_ID")
@@ -34,8 +39,8 @@ if not memory_id:
 # Get WhatsApp configuration from environment
 whatsapp_phone_number_id = os.getenv("WHATSAPP_PHONE_NUMBER_ID", "phone-number-id-fe268d418d9b4e1296c47f86795987df")
 
-print(f"Using MEMORY_ID: {memory_id}")
-print(f"Using WHATSAPP_PHONE_NUMBER_ID: {whatsapp_phone_number_id}")
+logger.info("Using MEMORY_ID: %s", memory_id)
+logger.info("Using WHATSAPP_PHONE_NUMBER_ID: %s", whatsapp_phone_number_id)
 
 
 agentcore_runtime = Runtime()
@@ -48,26 +53,30 @@ response = agentcore_runtime.configure(
     region=region,
     agent_name=agent_name
 )
-print("✅ Configuration successful!")
-print(response)
-print()
+logger.info("✅ Configuration successful!")
+logger.info("%s", response)
+logger.info("")
 
-print("🚀 Launching agent...")
+logger.info("🚀 Launching agent...")
 # Pass environment variables to the runtime
 env_vars = {
     "MEMORY_ID": memory_id,
     "WHATSAPP_PHONE_NUMBER_ID": whatsapp_phone_number_id
 }
+# Cache de respostas é opcional; só é repassado se estiver configurado no .env
+for cache_var in ("RESPONSE_CACHE_TTL_SECONDS", "RESPONSE_CACHE_MAX_ENTRIES"):
+    if os.getenv(cache_var):
+        env_vars[cache_var] = os.getenv(cache_var)
 launch_result = agentcore_runtime.launch(
     auto_update_on_conflict=True,
     env_vars=env_vars
 )
-print()
-print("✅ Launch successful!")
-print("🔍 Debug - launch_result structure:")
-print(f"Type: {type(launch_result)}")
-print("Full response:")
-print(launch_result)
+logger.info("")
+logger.info("✅ Launch successful!")
+logger.info("🔍 Debug - launch_result structure:")
+logger.info("Type: %s", type(launch_result))
+logger.info("Full response:")
+logger.info("%s", launch_result)
 
 # Save agent ID
 if hasattr(launch_result, 'agent_id'):
@@ -75,41 +84,18 @@ if hasattr(launch_result, 'agent_id'):
     os.makedirs("deployment", exist_ok=True)  # Criar diretório se não existir
     with open("deployment/agent_id.txt", "w") as f:
         f.write(agent_id)
-    print(f"\n📝 Agent ID saved: {agent_id}")
+    logger.info("\n📝 Agent ID saved: %s", agent_id)
 
 # Save Agent Runtime ARN to .env file
 if hasattr(launch_result, 'agent_arn'):
     agent_runtime_arn = launch_result.agent_arn
-    print(f"🎯 Found Agent ARN: {agent_runtime_arn}")
+    logger.info("🎯 Found Agent ARN: %s", agent_runtime_arn)
     
     # Update .env file
-    env_file_path = '.env'
-    if os.path.exists(env_file_path):
-        with open(env_file_path, 'r') as f:
-            lines = f.readlines()
-        
-        # Update AGENT_RUNTIME_ARN line
-        updated_lines = []
-        arn_updated = False
-        
-        for line in lines:
-            if line.startswith('AGENT_RUNTIME_ARN'):
-                updated_lines.append(f'AGENT_RUNTIME_ARN={agent_runtime_arn}\n')
-                arn_updated = True
-            else:
-                updated_lines.append(line)
-        
-        # Add AGENT_RUNTIME_ARN if not found
-        if not arn_updated:
-            updated_lines.append(f'AGENT_RUNTIME_ARN={agent_runtime_arn}\n')
-        
-        # Write back to .env file
-        with open(env_file_path, 'w') as f:
-            f.writelines(updated_lines)
-        
-        print(f"✅ .env file updated with AGENT_RUNTIME_ARN: {agent_runtime_arn}")
+    if utils.update_env_vars('.env', {'AGENT_RUNTIME_ARN': agent_runtime_arn}):
+        logger.info("✅ .env file updated with AGENT_RUNTIME_ARN: %s", agent_runtime_arn)
     else:
-        print("⚠️ .env file not found, please add AGENT_RUNTIME_ARN manually")
+        logger.warning("⚠️ .env file not found, please add AGENT_RUNTIME_ARN manually")
 else:
-    print("❌ Agent Runtime ARN not found in launch_result")
-    print("Available attributes:", [attr for attr in dir(launch_result) if not attr.startswith('_')])
\ No newline at end of file
+    logger.error("❌ Agent Runtime ARN not found in launch_result")
+    logger.info("Available attributes: %s", [attr for attr in dir(launch_result) if not attr.startswith('_')])
\ No newline at end of file
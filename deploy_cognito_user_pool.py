@@ -6,39 +6,57 @@ This script creates a Cognito User Pool identical to us-east-1_sUJtYFJc1
 with all the necessary configuration for the educational system.
 """
 
-import boto3
 import json
+import logging
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
+import aws_clients
+import utils
+
 # Load environment variables
 load_dotenv()
 
+logging.basicConfig(format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
+REQUIRED_ENV_VARS = ('DEMO_ADMIN_PHONE', 'DEMO_PROFESSOR_PHONE', 'DEMO_STUDENT_PHONE')
+
+# Basic validation for international phone numbers (E.164)
+_PHONE_RE = re.compile(r'^\+[1-9]\d{1,14}$')
+
 def validate_phone_number(phone_number):
     """
     Validate phone number format
     """
-    import re
-    # Basic validation for international phone numbers
-    pattern = r'^\+[1-9]\d{1,14}$'
-    return re.match(pattern, phone_number) is not None
+    return _PHONE_RE.match(phone_number) is not None
+
+def read_environment():
+    """
+    Snapshot the demo-user environment variables once so every step uses the same values
+    """
+    return {var: os.environ.get(var) for var in REQUIRED_ENV_VARS}
 
-def create_cognito_user_pool():
+def create_cognito_user_pool(env=None):
     """
     Create Cognito User Pool with the same configuration as us-east-1_sUJtYFJc1
     """
+    if env is None:
+        env = read_environment()
     
     # Initialize Cognito client
-    cognito_client = boto3.client('cognito-idp')
+    cognito_client = aws_clients.client('cognito-idp')
     
     # Get AWS account and region info
-    sts_client = boto3.client('sts')
-    account_id = sts_client.get_caller_identity()['Account']
-    region = boto3.Session().region_name
+    account_id = aws_clients.account_id()
+    region = aws_clients.region()
     
-    print(f"🚀 Creating Cognito User Pool in {region} (Account: {account_id})")
+    logger.info("🚀 Creating Cognito User Pool in %s (Account: %s)", region, account_id)
     
     try:
         # Create User Pool with identical configuration
@@ -144,7 +162,7 @@ def create_cognito_user_pool():
         )
         
         user_pool_id = user_pool_response['UserPool']['Id']
-        print(f"✅ User Pool created successfully: {user_pool_id}")
+        logger.info("✅ User Pool created successfully: %s", user_pool_id)
         
         # Create domain for the user pool
         domain_name = user_pool_id.replace('_', '').lower()
@@ -153,12 +171,12 @@ def create_cognito_user_pool():
                 Domain=domain_name,
                 UserPoolId=user_pool_id
             )
-            print(f"✅ Domain created: {domain_name}")
+            logger.info("✅ Domain created: %s", domain_name)
         except ClientError as e:
             if 'InvalidParameterException' in str(e):
-                print(f"⚠️ Domain already exists or invalid: {domain_name}")
+                logger.warning("⚠️ Domain already exists or invalid: %s", domain_name)
             else:
-                print(f"❌ Error creating domain: {e}")
+                logger.error("❌ Error creating domain: %s", e)
         
         # Create groups
         groups = [
@@ -179,7 +197,7 @@ def create_cognito_user_pool():
             }
         ]
         
-        for group in groups:
+        def create_group(group):
             try:
                 cognito_client.create_group(
                     GroupName=group['GroupName'],
@@ -187,20 +205,22 @@ def create_cognito_user_pool():
                     Description=group['Description'],
                     Precedence=group['Precedence']
                 )
-                print(f"✅ Group created: {group['GroupName']}")
+                logger.info("✅ Group created: %s", group['GroupName'])
+                return True
             except ClientError as e:
-                print(f"❌ Error creating group {group['GroupName']}: {e}")
+                logger.error("❌ Error creating group %s: %s", group['GroupName'], e)
+                return False
         
         # Get demo user phone numbers from environment variables
-        demo_admin_phone = os.getenv('DEMO_ADMIN_PHONE')
-        demo_professor_phone = os.getenv('DEMO_PROFESSOR_PHONE')
-        demo_student_phone = os.getenv('DEMO_STUDENT_PHONE')
+        demo_admin_phone = env['DEMO_ADMIN_PHONE']
+        demo_professor_phone = env['DEMO_PROFESSOR_PHONE']
+        demo_student_phone = env['DEMO_STUDENT_PHONE']
         
         # Validate phone numbers
-        if not all([demo_admin_phone, demo_professor_phone, demo_student_phone]):
-            print("⚠️ Warning: Demo phone numbers not found in environment variables.")
-            print("   Please set DEMO_ADMIN_PHONE, DEMO_PROFESSOR_PHONE, and DEMO_STUDENT_PHONE in .env file")
-            print("   Using default phone numbers for demo...")
+        if not all(env.values()):
+            logger.warning("⚠️ Warning: Demo phone numbers not found in environment variables.")
+            logger.info("   Please set DEMO_ADMIN_PHONE, DEMO_PROFESSOR_PHONE, and DEMO_STUDENT_PHONE in .env file")
+            logger.info("   Using default phone numbers for demo...")
             demo_admin_phone = '+5511987654321'
             demo_professor_phone = '+551146731805'
             demo_student_phone = '+5511123456789'
@@ -214,9 +234,9 @@ def create_cognito_user_pool():
             
             for var_name, phone in phone_numbers:
                 if not validate_phone_number(phone):
-                    print(f"❌ Invalid phone number format for {var_name}: {phone}")
-                    print("   Phone numbers must be in international format: +[country_code][area_code][number]")
-                    print("   Example: +5511987654321")
+                    logger.error("❌ Invalid phone number format for %s: %s", var_name, phone)
+                    logger.info("   Phone numbers must be in international format: +[country_code][area_code][number]")
+                    logger.info("   Example: +5511987654321")
                     return None
         
         # Create demo users
@@ -250,7 +270,8 @@ def create_cognito_user_pool():
             }
         ]
         
-        for user in demo_users:
+        def provision_demo_user(user):
+            # The three calls for a single user must stay in order
             try:
                 # Create user
                 cognito_client.admin_create_user(
@@ -277,48 +298,65 @@ def create_cognito_user_pool():
                     Permanent=True
                 )
                 
-                # Add user to group
+                # Add user to group, once that group's creation has finished
+                group_futures[user['group']].result()
                 cognito_client.admin_add_user_to_group(
                     UserPoolId=user_pool_id,
                     Username=user['username'],
                     GroupName=user['group']
                 )
                 
-                print(f"✅ Demo user created: {user['username']} ({user['persona']})")
+                logger.info("✅ Demo user created: %s (%s)", user['username'], user['persona'])
+                return True
                 
-            except ClientError as e:
-                print(f"❌ Error creating user {user['username']}: {e}")
+            except Exception as e:
+                logger.error("❌ Error creating user %s: %s", user['username'], e)
+                return False
+        
+        # Groups and users go through one pool: users only wait for their own
+        # group before the add-to-group call, so user creation overlaps with
+        # group creation. Each task catches its own errors so one failure
+        # doesn't hide the others.
+        with ThreadPoolExecutor(max_workers=len(groups) + len(demo_users)) as executor:
+            group_futures = {
+                group['GroupName']: executor.submit(create_group, group) for group in groups
+            }
+            provisioned = list(executor.map(provision_demo_user, demo_users))
+        created_users = [user for user, ok in zip(demo_users, provisioned) if ok]
         
         # Update .env file with new User Pool ID
         update_env_file(user_pool_id)
         
         # Print summary
-        print("\n" + "="*60)
-        print("🎉 COGNITO USER POOL DEPLOYMENT COMPLETE!")
-        print("="*60)
-        print(f"User Pool ID: {user_pool_id}")
-        print(f"Domain: {domain_name}")
-        print(f"Region: {region}")
-        print("\n📋 Demo Users Created:")
-        for user in demo_users:
-            print(f"  • {user['username']} ({user['persona']}) - Password: OctankDemo123!")
-        print("\n📱 Phone Numbers for WhatsApp Testing:")
+        logger.info("\n" + "="*60)
+        logger.info("🎉 COGNITO USER POOL DEPLOYMENT COMPLETE!")
+        logger.info("="*60)
+        logger.info("User Pool ID: %s", user_pool_id)
+        logger.info("Domain: %s", domain_name)
+        logger.info("Region: %s", region)
+        logger.info("\n📋 Demo Users Created:")
+        for user in created_users:
+            logger.info("  • %s (%s) - Password: OctankDemo123!", user['username'], user['persona'])
         for user in demo_users:
-            print(f"  • {user['persona']}: {user['phone']}")
-        print("\n🔧 Environment Variables Used:")
-        print(f"  • DEMO_ADMIN_PHONE: {demo_admin_phone}")
-        print(f"  • DEMO_PROFESSOR_PHONE: {demo_professor_phone}")
-        print(f"  • DEMO_STUDENT_PHONE: {demo_student_phone}")
-        print("\n⚠️ IMPORTANT:")
-        print("  • .env file updated with new USER_POOL_ID")
-        print("  • Demo passwords: OctankDemo123!")
-        print("  • Users are in their respective groups")
-        print("  • Custom persona attribute configured")
+            if user not in created_users:
+                logger.error("  • %s (%s) - ❌ not created, see errors above", user['username'], user['persona'])
+        logger.info("\n📱 Phone Numbers for WhatsApp Testing:")
+        for user in created_users:
+            logger.info("  • %s: %s", user['persona'], user['phone'])
+        logger.info("\n🔧 Environment Variables Used:")
+        logger.info("  • DEMO_ADMIN_PHONE: %s", demo_admin_phone)
+        logger.info("  • DEMO_PROFESSOR_PHONE: %s", demo_professor_phone)
+        logger.info("  • DEMO_STUDENT_PHONE: %s", demo_student_phone)
+        logger.warning("\n⚠️ IMPORTANT:")
+        logger.info("  • .env file updated with new USER_POOL_ID")
+        logger.info("  • Demo passwords: OctankDemo123!")
+        logger.info("  • Users are in their respective groups")
+        logger.info("  • Custom persona attribute configured")
         
         return user_pool_id
         
     except ClientError as e:
-        print(f"❌ Error creating User Pool: {e}")
+        logger.error("❌ Error creating User Pool: %s", e)
         return None
 
 def update_env_file(user_pool_id):
@@ -326,94 +364,63 @@ def update_env_file(user_pool_id):
     Update .env file with new User Pool ID
     """
     try:
-        # Read current .env file
-        env_file_path = '.env'
-        if os.path.exists(env_file_path):
-            with open(env_file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Update USER_POOL_ID line
-            updated_lines = []
-            user_pool_updated = False
-            
-            for line in lines:
-                if line.startswith('USER_POOL_ID'):
-                    updated_lines.append(f'USER_POOL_ID={user_pool_id}\n')
-                    user_pool_updated = True
-                else:
-                    updated_lines.append(line)
-            
-            # Add USER_POOL_ID if not found
-            if not user_pool_updated:
-                updated_lines.append(f'USER_POOL_ID={user_pool_id}\n')
-            
-            # Write back to .env file
-            with open(env_file_path, 'w') as f:
-                f.writelines(updated_lines)
-            
-            print(f"✅ .env file updated with USER_POOL_ID: {user_pool_id}")
+        if utils.update_env_vars('.env', {'USER_POOL_ID': user_pool_id}):
+            logger.info("✅ .env file updated with USER_POOL_ID: %s", user_pool_id)
         else:
-            print("⚠️ .env file not found, please add USER_POOL_ID manually")
+            logger.warning("⚠️ .env file not found, please add USER_POOL_ID manually")
             
     except Exception as e:
-        print(f"❌ Error updating .env file: {e}")
+        logger.error("❌ Error updating .env file: %s", e)
 
-def check_environment_variables():
+def check_environment_variables(env):
     """
     Check if required environment variables are set
     """
-    required_vars = ['DEMO_ADMIN_PHONE', 'DEMO_PROFESSOR_PHONE', 'DEMO_STUDENT_PHONE']
-    missing_vars = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
-    if missing_vars:
-        print("⚠️ Missing environment variables:")
-        for var in missing_vars:
-            print(f"   • {var}")
-        print("\n📝 Please add these variables to your .env file:")
-        print("   DEMO_ADMIN_PHONE=+5511987654321")
-        print("   DEMO_PROFESSOR_PHONE=+551146731805")
-        print("   DEMO_STUDENT_PHONE=+5511123456789")
-        print("\n💡 Phone numbers must be in international format: +[country][area][number]")
-        return False
+    if all(env.values()):
+        return True
     
-    return True
+    missing_vars = [var for var, value in env.items() if not value]
+    logger.warning("⚠️ Missing environment variables:")
+    for var in missing_vars:
+        logger.info("   • %s", var)
+    logger.info("\n📝 Please add these variables to your .env file:")
+    logger.info("   DEMO_ADMIN_PHONE=+5511987654321")
+    logger.info("   DEMO_PROFESSOR_PHONE=+551146731805")
+    logger.info("   DEMO_STUDENT_PHONE=+5511123456789")
+    logger.info("\n💡 Phone numbers must be in international format: +[country][area][number]")
+    return False
 
 def main():
     """
     Main function
     """
-    print("🚀 Octank Educational Multi-Agent System")
-    print("📋 Cognito User Pool Deployment Script")
-    print("-" * 50)
+    logger.info("🚀 Octank Educational Multi-Agent System")
+    logger.info("📋 Cognito User Pool Deployment Script")
+    logger.info("-" * 50)
     
     # Check AWS credentials
     try:
-        sts_client = boto3.client('sts')
-        identity = sts_client.get_caller_identity()
-        print(f"✅ AWS credentials configured for account: {identity['Account']}")
+        logger.info("✅ AWS credentials configured for account: %s", aws_clients.account_id())
     except Exception as e:
-        print(f"❌ AWS credentials not configured: {e}")
+        logger.error("❌ AWS credentials not configured: %s", e)
         sys.exit(1)
     
     # Check environment variables
-    if not check_environment_variables():
-        print("\n❌ Please configure the required environment variables before continuing.")
+    env = read_environment()
+    if not check_environment_variables(env):
+        logger.error("\n❌ Please configure the required environment variables before continuing.")
         sys.exit(1)
     
     # Create User Pool
-    user_pool_id = create_cognito_user_pool()
+    user_pool_id = create_cognito_user_pool(env)
     
     if user_pool_id:
-        print(f"\n🎯 Next steps:")
-        print(f"  1. Update your Lambda function with USER_POOL_ID: {user_pool_id}")
-        print(f"  2. Test WhatsApp integration with demo phone numbers")
-        print(f"  3. Deploy AgentCore Runtime with updated configuration")
+        logger.info("\n🎯 Next steps:")
+        logger.info("  1. Update your Lambda function with USER_POOL_ID: %s", user_pool_id)
+        logger.info("  2. Test WhatsApp integration with demo phone numbers")
+        logger.info("  3. Deploy AgentCore Runtime with updated configuration")
     else:
-        print("❌ Failed to create User Pool")
+        logger.error("❌ Failed to create User Pool")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -1,27 +1,25 @@
-import os
-import time
-import boto3
 import logging
-import botocore
-import json
-from textwrap import dedent
 import os
 import sys
-import glob
-sys.path.insert(0, '..') 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from boto3.s3.transfer import TransferConfig
 
+import aws_clients
 from knowledge_base_helper import KnowledgeBasesForAmazonBedrock
 
+logging.basicConfig(format='%(message)s', stream=sys.stdout)
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
+
 kb = KnowledgeBasesForAmazonBedrock() #cria a knowledge base
 
-s3_client = boto3.client('s3')
-sts_client = boto3.client('sts')
-bedrock_agent_runtime_client = boto3.client('bedrock-agent-runtime')
+s3_client = aws_clients.client('s3')
 
 
-region = boto3.session.Session().region_name
-account_id = sts_client.get_caller_identity()["Account"]
+region = aws_clients.region()
+account_id = aws_clients.account_id()
 suffix = f"{region}-{account_id}"
 bucket_name = f'agentcore-workshop-{suffix}'
 
@@ -38,28 +36,60 @@ kb_id, ds_id = kb.create_or_retrieve_knowledge_base(
     bucket_name
 )
 
-print(f"Knowledge Base ID: {kb_id}")
-print(f"Data Source ID: {ds_id}")
+logger.info("Knowledge Base ID: %s", kb_id)
+logger.info("Data Source ID: %s", ds_id)
 
 
 #Upload dos arquivos do S3 para incrementar na knowledge base
-import boto3
+# Arquivos grandes vão em multipart com partes em paralelo; o pool de conexões
+# do cliente compartilhado (aws_clients) comporta essas threads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+    max_io_queue=100
+)
 
 def upload_file_to_s3(file_path, bucket_name, object_key=None):
-    """Upload a file to S3 bucket"""
-    s3_client = boto3.client('s3')
-    
-    # Check if bucket exists, create if not
-    existing_buckets = [bucket['Name'] for bucket in s3_client.list_buckets()['Buckets']]
-    if bucket_name not in existing_buckets:
-        s3_client.create_bucket(Bucket=bucket_name)
-    
+    """Upload a file to S3 bucket (the bucket must already exist)"""
     if object_key is None:
         object_key = file_path.split('/')[-1]
     
-    s3_client.upload_file(file_path, bucket_name, object_key)
+    # Arquivos pequenos vão num único PutObject, sem o overhead do Transfer Manager
+    if os.path.getsize(file_path) < TRANSFER_CONFIG.multipart_threshold:
+        with open(file_path, 'rb') as f:
+            s3_client.put_object(Bucket=bucket_name, Key=object_key, Body=f)
+    else:
+        s3_client.upload_file(file_path, bucket_name, object_key, Config=TRANSFER_CONFIG)
     return f"s3://{bucket_name}/{object_key}"
 
+def upload_text_to_s3(body, bucket_name, object_key):
+    """Upload an in-memory text document to S3 bucket"""
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=object_key,
+        Body=body.encode('utf-8'),
+        ContentType='text/plain; charset=utf-8'
+    )
+    return f"s3://{bucket_name}/{object_key}"
+
+def bundle_kb_docs_by_subject(txt_files):
+    """
+    Concatena os documentos de cada matéria (prefixo do nome antes do '_') em um único texto
+
+    Cada documento já começa com uma linha de título, então o chunking da KB
+    continua separando bem os tópicos; a ingestão só processa um objeto por matéria.
+    """
+    bundles = defaultdict(list)
+    for file_path in sorted(txt_files):
+        subject = os.path.basename(file_path).split('_', 1)[0]
+        with open(file_path, encoding='utf-8') as f:
+            bundles[subject].append(f.read().strip())
+    return {
+        f"documents/{subject.replace(' ', '_')}_bundle.txt": "\n\n".join(docs) + "\n"
+        for subject, docs in bundles.items()
+    }
 
 
 def upload_all_kb_docs_to_s3(bucket_name):
@@ -69,37 +99,54 @@ def upload_all_kb_docs_to_s3(bucket_name):
     docs_dir = "utils/knowledge_base_docs"
     
     # Buscar todos os arquivos .txt
-    txt_files = glob.glob(os.path.join(docs_dir, "*.txt"))
+    with os.scandir(docs_dir) as entries:
+        txt_files = [entry.path for entry in entries if entry.is_file() and entry.name.endswith('.txt')]
     
     uploaded_files = []
     
-    for file_path in txt_files:
-        try:
-            # Nome do arquivo para usar como chave S3
-            filename = os.path.basename(file_path)
-            object_key = f"documents/{filename}"
-            
-            # Upload do arquivo
-            s3_url = upload_file_to_s3(file_path, bucket_name, object_key)
-            uploaded_files.append(s3_url)
-            print(f"✓ Uploaded: {filename}")
-            
-        except Exception as e:
-            print(f"✗ Failed to upload {file_path}: {str(e)}")
+    # Garante o bucket uma única vez (head_bucket), antes dos uploads
+    kb.create_s3_bucket(bucket_name)
+    
+    # KB_BUNDLE_DOCS=true envia um arquivo por matéria em vez de um por tópico,
+    # reduzindo o número de objetos que a ingestão precisa processar.
+    # Use em um bucket novo (ou limpe documents/) para não indexar o conteúdo duas vezes.
+    if os.getenv('KB_BUNDLE_DOCS', 'false').lower() == 'true':
+        uploads = [
+            (upload_text_to_s3, (body, bucket_name, object_key), object_key)
+            for object_key, body in bundle_kb_docs_by_subject(txt_files).items()
+        ]
+    else:
+        uploads = [
+            (upload_file_to_s3, (file_path, bucket_name, f"documents/{os.path.basename(file_path)}"), file_path)
+            for file_path in txt_files
+        ]
+    
+    # Uploads em paralelo usando o cliente S3 compartilhado (thread-safe)
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {executor.submit(upload, *args): name for upload, args, name in uploads}
+        
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                uploaded_files.append(future.result())
+                logger.info("✓ Uploaded: %s", os.path.basename(name))
+                
+            except Exception as e:
+                logger.error("✗ Failed to upload %s: %s", name, e)
     
     return uploaded_files
 
 uploaded = upload_all_kb_docs_to_s3(bucket_name)
-print(f"Total uploaded: {len(uploaded)} files")
+logger.info("Total uploaded: %s files", len(uploaded))
 
 
 # Start an ingestion job to synchronize data
 kb.synchronize_data(kb_id, ds_id)
-print('KB synchronization completed\n')
+logger.info('KB synchronization completed\n')
 
 #salva o parametro no SSM Parameter store para consulta depois
 param_name = '/app/octank_assistant/agentcore/kb_id'
 
-ssm = boto3.client("ssm")
+ssm = aws_clients.client("ssm")
 ssm.put_parameter(Name=param_name, Value=kb_id, Type="String", Overwrite=True)
-print(f"Stored {kb_id} in SSM: {param_name}")
\ No newline at end of file
+logger.info("Stored %s in SSM: %s", kb_id, param_name)
\ No newline at end of file
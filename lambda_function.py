@@ -1,16 +1,99 @@
 
 import json
+import logging
 import os
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
 WHATSAPP_PHONE_NUMBER_ID = os.environ.get('WHATSAPP_PHONE_NUMBER_ID')
 
+# O runtime da Lambda já configura um handler no root logger
+logger = logging.getLogger()
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
+
+# Limite de envios simultâneos quando o evento traz várias mensagens
+MAX_PARALLEL_SENDS = 10
+
+# Caracteres removidos do número de telefone ('+', '-' e espaço)
+_PHONE_STRIP = str.maketrans('', '', '+- ')
+
+# Cliente AWS End User Messaging, criado uma vez por container e reutilizado
+# entre invocações. send_whatsapp_message não é idempotente: um retry após
+# timeout de leitura pode entregar a mesma mensagem duas vezes, então o envio
+# roda sem retries e com read_timeout folgado
+socialmessaging_client = boto3.client(
+    'socialmessaging',
+    region_name='us-east-1',
+    config=Config(
+        retries={'max_attempts': 1, 'mode': 'standard'},
+        tcp_keepalive=True,
+        connect_timeout=1,
+        read_timeout=30
+    )
+)
+
+def _send_whatsapp_message(phone_number, message):
+    """
+    Envia uma mensagem de texto WhatsApp e retorna (número limpo, message id)
+    """
+    # Limpa formato do número
+    clean_phone = phone_number.translate(_PHONE_STRIP)
+    
+    # Mensagem no formato WhatsApp API
+    meta_message = {
+        "messaging_product": "whatsapp",
+        "to": f"+{clean_phone}",
+        "type": "text",
+        "text": {
+            "preview_url": False,
+            "body": message
+        }
+    }
+    
+    logger.info("📤 Enviando mensagem para +%s...", clean_phone)
+    
+    response = socialmessaging_client.send_whatsapp_message(
+        originationPhoneNumberId=WHATSAPP_PHONE_NUMBER_ID,
+        message=json.dumps(meta_message),
+        metaApiVersion='v20.0'
+    )
+    
+    whatsapp_msg_id = response.get('messageId', '')
+    
+    logger.info("✅ Mensagem enviada: %s", whatsapp_msg_id)
+    
+    return clean_phone, whatsapp_msg_id
+
+def _send_many(messages):
+    """
+    Envia várias mensagens em paralelo, uma thread por envio
+
+    O cliente boto3 é thread-safe, então todas as threads compartilham o
+    cliente do módulo. Falhas são reportadas por destinatário.
+    """
+    def send(item):
+        try:
+            clean_phone, whatsapp_msg_id = _send_whatsapp_message(item['phone_number'], item['message'])
+            return {'success': True, 'message_id': whatsapp_msg_id, 'recipient': f"+{clean_phone}"}
+        except Exception as e:
+            logger.error("❌ Erro ao enviar para %s: %s", item['phone_number'], e)
+            return {'success': False, 'recipient': item['phone_number'], 'error': str(e)}
+    
+    with ThreadPoolExecutor(max_workers=min(len(messages), MAX_PARALLEL_SENDS)) as executor:
+        return list(executor.map(send, messages))
+
 def lambda_handler(event, context):
     """
     Lambda handler para enviar mensagens WhatsApp via AgentCore Gateway
+
+    Aceita uma mensagem ({phone_number, message}) ou várias
+    ({messages: [{phone_number, message}, ...]}), enviadas em paralelo.
     """
-    print(f"📥 Event recebido: {json.dumps(event)}")
+    # O dump completo do evento só é útil para depuração
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📥 Event recebido: %s", json.dumps(event))
     
     # Extrai informações do contexto do Gateway
     client_context = context.client_context
@@ -18,13 +101,36 @@ def lambda_handler(event, context):
         custom = client_context.custom
         tool_name = custom.get('bedrockagentcoreToolName', 'unknown')
         session_id = custom.get('bedrockagentcoreSessionId', 'unknown')
-        print(f"🔧 Tool: {tool_name}, Session: {session_id}")
+        logger.info("🔧 Tool: %s, Session: %s", tool_name, session_id)
     
     try:
         # Parse do input
         if isinstance(event, str):
             event = json.loads(event)
         
+        messages = event.get('messages')
+        if isinstance(messages, list):
+            if not messages or not all(
+                isinstance(item, dict) and item.get('phone_number') and item.get('message')
+                for item in messages
+            ):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({
+                        'success': False,
+                        'error': 'cada item de messages precisa de phone_number e message'
+                    })
+                }
+            
+            results = _send_many(messages)
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'success': all(result['success'] for result in results),
+                    'results': results
+                })
+            }
+        
         phone_number = event.get('phone_number')
         message = event.get('message')
         
@@ -37,34 +143,7 @@ def lambda_handler(event, context):
                 })
             }
         
-        # Limpa formato do número
-        clean_phone = phone_number.replace('+', '').replace('-', '').replace(' ', '')
-        
-        # Cliente AWS End User Messaging
-        socialmessaging_client = boto3.client('socialmessaging', region_name='us-east-1')
-        
-        # Mensagem no formato WhatsApp API
-        meta_message = {
-            "messaging_product": "whatsapp",
-            "to": f"+{clean_phone}",
-            "type": "text",
-            "text": {
-                "preview_url": False,
-                "body": message
-            }
-        }
-        
-        print(f"📤 Enviando mensagem para +{clean_phone}...")
-        
-        response = socialmessaging_client.send_whatsapp_message(
-            originationPhoneNumberId=WHATSAPP_PHONE_NUMBER_ID,
-            message=json.dumps(meta_message),
-            metaApiVersion='v20.0'
-        )
-        
-        whatsapp_msg_id = response.get('messageId', '')
-        
-        print(f"✅ Mensagem enviada: {whatsapp_msg_id}")
+        clean_phone, whatsapp_msg_id = _send_whatsapp_message(phone_number, message)
         
         return {
             'statusCode': 200,
@@ -80,7 +159,7 @@ def lambda_handler(event, context):
         error_code = e.response.get('Error', {}).get('Code', 'Unknown')
         error_message = e.response.get('Error', {}).get('Message', str(e))
         
-        print(f"❌ Erro AWS: {error_code} - {error_message}")
+        logger.error("❌ Erro AWS: %s - %s", error_code, error_message)
         
         return {
             'statusCode': 500,
@@ -91,7 +170,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"❌ Erro: {str(e)}")
+        logger.error("❌ Erro: %s", e)
         
         return {
             'statusCode': 500,
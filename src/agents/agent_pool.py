@@ -0,0 +1,30 @@
+"""Reusable Strands agents for the sub-agent tools.
+
+Building an Agent registers its tools and sets up the model client, so the
+sub-agent tools keep one instance per worker thread instead of creating a new
+one on every call. A Strands Agent keeps its conversation in ``messages`` and
+rejects concurrent invocations, so an instance is never shared between threads
+and its history is cleared before each reuse.
+"""
+
+import threading
+
+from strands import Agent
+
+
+class ThreadLocalAgent:
+    """Lazily builds one Agent per thread from fixed constructor arguments."""
+
+    def __init__(self, **agent_kwargs):
+        self._agent_kwargs = agent_kwargs
+        self._local = threading.local()
+
+    def get(self) -> Agent:
+        """Return this thread's agent with an empty conversation history."""
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            agent = Agent(**self._agent_kwargs)
+            self._local.agent = agent
+        else:
+            agent.messages.clear()
+        return agent
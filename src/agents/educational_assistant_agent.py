@@ -4,34 +4,54 @@ This agent is exposed as a tool that can be invoked by the orchestrator.
 It returns dummy data for demonstration purposes.
 """
 
+import functools
 import os
 import boto3
 import logging
 from botocore.exceptions import ClientError
-from typing import Dict, Any
+from typing import List
 from pathlib import Path
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+_ENV_LOADED = False
+
 def load_env_variables():
-    """Load environment variables from .env file."""
+    """Load environment variables from .env file (only the first call reads it)."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    
     env_file = Path(__file__).parent.parent.parent / '.env'
     
     if env_file.exists():
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+        lines = (line.strip() for line in env_file.read_text().splitlines())
+        os.environ.update({
+            key.strip(): value.strip()
+            for line in lines
+            if line and not line.startswith('#') and '=' in line
+            for key, value in [line.split('=', 1)]
+        })
         logger.info(f"Loaded environment variables from {env_file}")
     else:
         logger.warning(f"Environment file not found at {env_file}")
+    _ENV_LOADED = True
 
+@functools.lru_cache(maxsize=None)
+def _ssm_client():
+    """Create the SSM client once, on first use (after .env has been loaded)."""
+    return boto3.client("ssm")
+
+@functools.lru_cache(maxsize=1)
 def get_kb_id_from_ssm():
+    # Containers that already carry the KB id (e.g. set by a parent process) skip SSM
+    cached = os.environ.get("KNOWLEDGE_BASE_ID")
+    if cached:
+        return cached
+    
     param_name = '/app/octank_assistant/agentcore/kb_id'
-    ssm = boto3.client("ssm")
+    ssm = _ssm_client()
     try:
         response = ssm.get_parameter(Name=param_name)
         kb_id = response["Parameter"]["Value"]
@@ -59,10 +79,50 @@ os.environ["AWS_REGION"] = aws_region
 logger.info(f"Octank Assistant runtime - configured for region: {aws_region}")
 
 # NOW import strands tools after environment is set
-from strands import Agent, tool
-from strands_tools import retrieve, calculator
+from strands import tool
+from strands_tools import retrieve
+from agent_pool import ThreadLocalAgent
 from mock_data_generator import generate_student_data
+from models.core import Course, Grade, PendingTask
+
+
+
+_SYSTEM_PROMPT_TEMPLATE = """You are an Educational Assistant that helps students with academic queries.
+
+You can provide information about:
+- Pending tasks and assignments
+- Enrolled courses and teachers
+- Current grades
+- Subjects requiring focus (grade < 5.0)
+- Retrieve subject content on Knowledge bases, when a student ask for the content for the next text you MUST retrieve the content from that subject from the knowledge base configured from id {kb_id} and use retrieve tool
+
+Use the mock data provided to answer student questions in a helpful and encouraging manner.
+Be supportive and provide actionable advice when students are struggling.
+Format your responses clearly and concisely.
+
+When discussing grades:
+- Grades are on a 0-10 scale
+- Grades below 5.0 indicate areas needing focus
+- Encourage students to seek help in challenging subjects
+- search for content on the knowledge base to generate tips on what the studentshould focus
+
+When discussing tasks:
+- Prioritize tasks by due date
+- Encourage time management
+- Suggest breaking down complex assignments
+"""
 
+_SYSTEM_PROMPT = _SYSTEM_PROMPT_TEMPLATE.format(kb_id=kb_id)
+
+# Personas allowed to use this tool
+_ALLOWED_PERSONAS = frozenset({"student", "administrator"})
+
+# One educational assistant agent per worker thread, reused across calls
+_educational_agents = ThreadLocalAgent(
+    model="openai.gpt-oss-20b-1:0",
+    tools= [retrieve],
+    system_prompt=_SYSTEM_PROMPT
+)
 
 
 @tool
@@ -83,90 +143,30 @@ def answer_student_questions(query: str, student_id: str = None, persona: str =
     Returns:
         String response from the educational assistant agent
     """
-    global kb_id
     # Validate persona - only students should access this tool
-    if persona not in ["student", "administrator"]:
+    if persona not in _ALLOWED_PERSONAS:
         return f"Access denied: This tool is only available for student and administrator personas. Current persona: {persona}"
     
     # Generate mock student data scoped to the persona
     student_data = generate_student_data(student_id)
     
-    # Format mock data for context
-    mock_data = {
-        "student_id": student_data.student_id,
-        "student_name": student_data.student_name,
-        "pending_tasks": [
-            {
-                "course_name": task.course_name,
-                "task_id": task.task_id,
-                "due_date": task.due_date
-            }
-            for task in student_data.pending_tasks
-        ],
-        "enrolled_courses": [
-            {
-                "course_name": course.course_name,
-                "course_id": course.course_id,
-                "teacher_name": course.teacher_name
-            }
-            for course in student_data.enrolled_courses
-        ],
-        "grades": [
-            {
-                "course_name": grade.course_name,
-                "course_id": grade.course_id,
-                "grade": grade.grade
-            }
-            for grade in student_data.grades
-        ],
-        "focus_areas": student_data.focus_areas
-    }
-    
-    # Create the educational assistant agent
-    educational_agent = Agent(
-        model="openai.gpt-oss-20b-1:0",
-        tools= [retrieve],
-        system_prompt=f"""You are an Educational Assistant that helps students with academic queries.
-
-You can provide information about:
-- Pending tasks and assignments
-- Enrolled courses and teachers
-- Current grades
-- Subjects requiring focus (grade < 5.0)
-- Retrieve subject content on Knowledge bases, when a student ask for the content for the next text you MUST retrieve the content from that subject from the knowledge base configured from id {kb_id} and use retrieve tool
-
-Use the mock data provided to answer student questions in a helpful and encouraging manner.
-Be supportive and provide actionable advice when students are struggling.
-Format your responses clearly and concisely.
-
-When discussing grades:
-- Grades are on a 0-10 scale
-- Grades below 5.0 indicate areas needing focus
-- Encourage students to seek help in challenging subjects
-- search for content on the knowledge base to generate tips on what the studentshould focus
-
-When discussing tasks:
-- Prioritize tasks by due date
-- Encourage time management
-- Suggest breaking down complex assignments
-"""
-    )
+    educational_agent = _educational_agents.get()
     
     # Inject mock data into the query context with persona information
     context = f"""Mock Academic Data for {student_data.student_name} (ID: {student_data.student_id}):
 [Requesting Persona: {persona}]
 
 Enrolled Courses:
-{_format_courses(mock_data['enrolled_courses'])}
+{_format_courses(student_data.enrolled_courses)}
 
 Current Grades:
-{_format_grades(mock_data['grades'])}
+{_format_grades(student_data.grades)}
 
 Pending Tasks:
-{_format_tasks(mock_data['pending_tasks'])}
+{_format_tasks(student_data.pending_tasks)}
 
 Focus Areas (grades < 5.0):
-{', '.join(mock_data['focus_areas']) if mock_data['focus_areas'] else 'None - all grades are satisfactory!'}
+{', '.join(student_data.focus_areas) if student_data.focus_areas else 'None - all grades are satisfactory!'}
 
 Student Query: {query}
 """
@@ -177,35 +177,35 @@ Student Query: {query}
     return str(response)
 
 
-def _format_courses(courses: list) -> str:
+def _format_courses(courses: List[Course]) -> str:
     """Format course list for display."""
     if not courses:
         return "No enrolled courses"
     
-    lines = []
-    for course in courses:
-        lines.append(f"  - {course['course_name']} ({course['course_id']}) - Teacher: {course['teacher_name']}")
-    return "\n".join(lines)
+    return "\n".join(
+        f"  - {course.course_name} ({course.course_id}) - Teacher: {course.teacher_name}"
+        for course in courses
+    )
 
 
-def _format_grades(grades: list) -> str:
+def _format_grades(grades: List[Grade]) -> str:
     """Format grades list for display."""
     if not grades:
         return "No grades available"
     
-    lines = []
-    for grade in grades:
-        status = "⚠️ Needs Focus" if grade['grade'] < 5.0 else "✓ Good"
-        lines.append(f"  - {grade['course_name']}: {grade['grade']:.1f}/10.0 {status}")
-    return "\n".join(lines)
+    return "\n".join(
+        f"  - {grade.course_name}: {grade.grade:.1f}/10.0 "
+        f"{'⚠️ Needs Focus' if grade.grade < 5.0 else '✓ Good'}"
+        for grade in grades
+    )
 
 
-def _format_tasks(tasks: list) -> str:
+def _format_tasks(tasks: List[PendingTask]) -> str:
     """Format tasks list for display."""
     if not tasks:
         return "No pending tasks"
     
-    lines = []
-    for task in tasks:
-        lines.append(f"  - {task['course_name']}: {task['task_id']} (Due: {task['due_date']})")
-    return "\n".join(lines)
+    return "\n".join(
+        f"  - {task.course_name}: {task.task_id} (Due: {task.due_date})"
+        for task in tasks
+    )
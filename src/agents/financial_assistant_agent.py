@@ -4,52 +4,14 @@ This agent is exposed as a tool that can be invoked by the orchestrator.
 It returns dummy data for demonstration purposes.
 """
 
-from strands import Agent, tool
-from typing import Dict, Any
+from strands import tool
 
+from agent_pool import ThreadLocalAgent
 from mock_data_generator import generate_payment_data
+from models.core import PaymentInfo
 
 
-@tool
-def answer_payment_questions(query: str, student_id: str = None, persona: str = "student") -> str:
-    """Tool that handles payment and financial questions using a specialized agent.
-    
-    This tool provides information about:
-    - Pending payments and overdue amounts
-    - Recent payment history
-    - Payment receipt status
-    - Payment processing simulations
-    
-    Args:
-        query: The payment-related question
-        student_id: Optional student ID for personalized payment data
-        persona: The persona type making the request (default: "student")
-    
-    Returns:
-        String response from the financial assistant agent
-    """
-    
-    # All personas can access payment information
-    # Students see their own data, administrators see all data
-    
-    # Generate mock payment data scoped to the persona
-    payment_data = generate_payment_data(student_id)
-    
-    # Format mock data for context
-    mock_data = {
-        "student_id": payment_data.student_id,
-        "student_name": payment_data.student_name,
-        "unpaid_months": payment_data.unpaid_months,
-        "amount_due": payment_data.amount_due,
-        "payment_month": payment_data.payment_month,
-        "status": payment_data.status,
-        "receipt_id": payment_data.receipt_id
-    }
-    
-    # Create the financial assistant agent
-    financial_agent = Agent(
-        model="openai.gpt-oss-20b-1:0",
-        system_prompt="""You are a Financial Assistant that helps with payment queries.
+_SYSTEM_PROMPT = """You are a Financial Assistant that helps with payment queries.
 
 You can provide information about:
 - Pending payments and overdue amounts
@@ -77,7 +39,40 @@ When simulating receipt processing:
 - Provide mock confirmation with receipt ID
 - Indicate successful processing
 """
-    )
+
+# One financial assistant agent per worker thread, reused across calls
+_financial_agents = ThreadLocalAgent(
+    model="openai.gpt-oss-20b-1:0",
+    system_prompt=_SYSTEM_PROMPT
+)
+
+
+@tool
+def answer_payment_questions(query: str, student_id: str = None, persona: str = "student") -> str:
+    """Tool that handles payment and financial questions using a specialized agent.
+    
+    This tool provides information about:
+    - Pending payments and overdue amounts
+    - Recent payment history
+    - Payment receipt status
+    - Payment processing simulations
+    
+    Args:
+        query: The payment-related question
+        student_id: Optional student ID for personalized payment data
+        persona: The persona type making the request (default: "student")
+    
+    Returns:
+        String response from the financial assistant agent
+    """
+    
+    # All personas can access payment information
+    # Students see their own data, administrators see all data
+    
+    # Generate mock payment data scoped to the persona
+    payment_data = generate_payment_data(student_id)
+    
+    financial_agent = _financial_agents.get()
     
     # Inject mock data into the query context with persona information
     context = f"""Mock Payment Data for {payment_data.student_name} (ID: {payment_data.student_id}):
@@ -86,7 +81,7 @@ When simulating receipt processing:
 Payment Status: {payment_data.status.upper()}
 Current Month: {payment_data.payment_month}
 
-{_format_payment_status(mock_data)}
+{_format_payment_status(payment_data)}
 
 Payment Query: {query}
 """
@@ -97,25 +92,28 @@ Payment Query: {query}
     return str(response)
 
 
-def _format_payment_status(payment_data: dict) -> str:
+def _format_payment_status(payment_data: PaymentInfo) -> str:
     """Format payment status for display."""
-    lines = []
-    
-    if payment_data['status'] == 'paid':
-        lines.append("✓ All payments are current!")
-        if payment_data['receipt_id']:
-            lines.append(f"  Last Receipt ID: {payment_data['receipt_id']}")
-        lines.append(f"  Amount Due: ${payment_data['amount_due']:.2f}")
+    if payment_data.status == 'paid':
+        receipt = f"\n  Last Receipt ID: {payment_data.receipt_id}" if payment_data.receipt_id else ""
+        return (
+            f"✓ All payments are current!{receipt}\n"
+            f"  Amount Due: ${payment_data.amount_due:.2f}"
+        )
     
-    elif payment_data['status'] == 'overdue':
-        lines.append("⚠️ OVERDUE PAYMENTS")
-        lines.append(f"  Unpaid Months: {', '.join(payment_data['unpaid_months'])}")
-        lines.append(f"  Total Amount Due: ${payment_data['amount_due']:.2f}")
-        lines.append(f"  Monthly Rate: $600.00")
+    if payment_data.status == 'overdue':
+        return (
+            "⚠️ OVERDUE PAYMENTS\n"
+            f"  Unpaid Months: {', '.join(payment_data.unpaid_months)}\n"
+            f"  Total Amount Due: ${payment_data.amount_due:.2f}\n"
+            "  Monthly Rate: $600.00"
+        )
     
-    elif payment_data['status'] == 'pending':
-        lines.append("⏳ Payment Pending")
-        lines.append(f"  Amount Due: ${payment_data['amount_due']:.2f}")
-        lines.append(f"  Due Date: 1st of {payment_data['payment_month']}")
+    if payment_data.status == 'pending':
+        return (
+            "⏳ Payment Pending\n"
+            f"  Amount Due: ${payment_data.amount_due:.2f}\n"
+            f"  Due Date: 1st of {payment_data.payment_month}"
+        )
     
-    return "\n".join(lines)
+    return ""
@@ -4,23 +4,11 @@ This agent is exposed as a tool that can be invoked by the orchestrator.
 It handles general queries about school policies, procedures, and educational topics.
 """
 
-from strands import Agent, tool
+from strands import tool
 
-@tool
-def answer_general_questions(query: str, persona: str = "student") -> str:
-    """Tool that handles general educational system questions.
-    
-    Args:
-        query: The general question about the educational system
-        persona: The persona type making the request (default: "student")
-    
-    Returns:
-        String response from the general questions agent
-    """
-    # Create the general questions agent
-    general_agent = Agent(
-        model="openai.gpt-oss-20b-1:0",
-        system_prompt="""You are a General Questions Assistant for the educational system.
+from agent_pool import ThreadLocalAgent
+
+_SYSTEM_PROMPT = """You are a General Questions Assistant for the educational system.
 
 You can provide information about:
 - School policies and procedures (enrollment, attendance, grading policies)
@@ -47,7 +35,26 @@ For GENERAL questions, provide helpful, accurate information in a friendly manne
 
 Format your responses clearly and professionally.
 """
-    )
+
+# One general questions agent per worker thread, reused across calls
+_general_agents = ThreadLocalAgent(
+    model="openai.gpt-oss-20b-1:0",
+    system_prompt=_SYSTEM_PROMPT
+)
+
+
+@tool
+def answer_general_questions(query: str, persona: str = "student") -> str:
+    """Tool that handles general educational system questions.
+    
+    Args:
+        query: The general question about the educational system
+        persona: The persona type making the request (default: "student")
+    
+    Returns:
+        String response from the general questions agent
+    """
+    general_agent = _general_agents.get()
     
     # Simple context with system information
     context = f"""Educational System Information:
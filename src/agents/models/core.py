@@ -2,10 +2,10 @@
 
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class PersonaContext:
     """Context for a user persona."""
     persona_type: str  # "student" | "teacher" | "administrator"
@@ -14,7 +14,7 @@ class PersonaContext:
     query_timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PendingTask:
     """A pending task/assignment."""
     task_id: str
@@ -23,7 +23,7 @@ class PendingTask:
     due_date: str  # ISO 8601 format
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Course:
     """Course enrollment information."""
     course_id: str
@@ -31,7 +31,7 @@ class Course:
     teacher_name: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Grade:
     """Student grade for a course."""
     course_id: str
@@ -39,7 +39,7 @@ class Grade:
     grade: float  # 0-10 scale
 
 
-@dataclass
+@dataclass(slots=True)
 class StudentData:
     """Complete student data structure."""
     student_id: str
@@ -50,7 +50,7 @@ class StudentData:
     focus_areas: List[str]  # Courses with grade < 5.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TeacherCourseMetrics:
     """Metrics for a teacher's course."""
     course_id: str
@@ -59,7 +59,7 @@ class TeacherCourseMetrics:
     overdue_tasks: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LowPerformingStudent:
     """Student with low performance."""
     student_id: str
@@ -69,7 +69,7 @@ class LowPerformingStudent:
     grade: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TeacherData:
     """Complete teacher data structure."""
     teacher_id: str
@@ -79,19 +79,19 @@ class TeacherData:
     low_performers: List[LowPerformingStudent]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PaymentInfo:
     """Payment information."""
     student_id: str
     student_name: Optional[str]
-    unpaid_months: List[str]
+    unpaid_months: Tuple[str, ...]
     amount_due: float
     payment_month: Optional[str]
     status: str  # "paid" | "pending" | "overdue"
     receipt_id: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TeacherMetrics:
     """Teacher performance metrics."""
     teacher_id: str
@@ -99,12 +99,12 @@ class TeacherMetrics:
     classes_taught_last_week: int
     grades_published_last_week: int
     below_average_percentage: float
-    insights: List[str]
+    insights: Tuple[str, ...]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AdministratorData:
-    """Complete administrator data structure."""
-    delinquent_students: List[PaymentInfo]
-    low_performing_students: List[LowPerformingStudent]
-    teacher_performance: List[TeacherMetrics]
+    """Complete administrator data structure (immutable, shared between callers)."""
+    delinquent_students: Tuple[PaymentInfo, ...]
+    low_performing_students: Tuple[LowPerformingStudent, ...]
+    teacher_performance: Tuple[TeacherMetrics, ...]
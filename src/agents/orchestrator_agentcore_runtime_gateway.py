@@ -30,14 +30,23 @@ Deployment:
 - Invoke via AgentCore Runtime API with session management
 """
 
+import asyncio
 import os
+import functools
+import importlib
+import json
 import logging
+import logging.config
+import re
 import boto3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from boto3 import Session
 from botocore.exceptions import ClientError
-from typing import Dict, Any, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 import uuid
 
 # Load environment variables from .env file
@@ -50,9 +59,9 @@ env_path = project_root / '.env'
 # Load .env file if it exists
 if env_path.exists():
     load_dotenv(dotenv_path=env_path)
-    logging.info(f"Loaded environment variables from {env_path}")
+    logging.info("Loaded environment variables from %s", env_path)
 else:
-    logging.warning(f".env file not found at {env_path}")
+    logging.warning(".env file not found at %s", env_path)
 
 # AgentCore imports
 from bedrock_agentcore import BedrockAgentCoreApp
@@ -67,34 +76,27 @@ from bedrock_agentcore.memory.integrations.strands.config import (
 
 # Strands imports
 from strands import Agent
-from strands_tools import retrieve, calculator
 
 # Add current directory to Python path for local imports
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-# Import sub-agent tools (using local imports with path adjustment)
-from educational_assistant_agent import answer_student_questions
-from teacher_assistant_agent import answer_teacher_questions
-from financial_assistant_agent import answer_payment_questions
-from virtual_secretary_agent import answer_admin_questions
-from general_questions_agent import answer_general_questions
+from response_cache import ResponseCache, normalize_query
+
+# Sub-agent tools as (module, function). They are imported on first use (see
+# get_sub_agent_tools) so the runtime can start serving before every
+# sub-agent module, and the models/tools they pull in, has been loaded.
+SUB_AGENT_TOOLS = (
+    ("educational_assistant_agent", "answer_student_questions"),
+    ("teacher_assistant_agent", "answer_teacher_questions"),
+    ("financial_assistant_agent", "answer_payment_questions"),
+    ("virtual_secretary_agent", "answer_admin_questions"),
+    ("general_questions_agent", "answer_general_questions"),
+)
 
 
 #Gateway imports
-import io
-import time
-import logging
-import botocore
-import json
-import asyncio
-from textwrap import dedent
-from datetime import datetime, timedelta
 from strands.tools.mcp import MCPClient
-from mcp.client.streamable_http import streamablehttp_client
-from strands.tools.mcp.mcp_client import MCPClient
-from strands import Agent, tool
-from strands.models import BedrockModel
 
 # Import utils from project root (2 levels up)
 sys.path.insert(0, str(project_root))
@@ -106,24 +108,37 @@ import utils
 # ============================================================================
 
 # Set up logging for Strands components
-loggers = [
+STRANDS_LOGGERS = (
     'strands',
     'strands.agent',
     'strands.tools',
     'strands.models',
     'strands.bedrock'
-]
-
-for logger_name in loggers:
-    logger = logging.getLogger(logger_name)
-    logger.setLevel(logging.INFO)
-    if not logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+)
+
+LOGGING_CONFIG = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'strands': {
+            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        }
+    },
+    'handlers': {
+        'strands': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'strands'
+        }
+    },
+    'loggers': {
+        logger_name: {'level': 'INFO', 'handlers': ['strands']}
+        for logger_name in STRANDS_LOGGERS
+    }
+}
+
+# Configure once per process; re-imports keep the existing handlers
+if not logging.getLogger('strands').handlers:
+    logging.config.dictConfig(LOGGING_CONFIG)
 
 # Main logger
 logging.basicConfig(
@@ -142,14 +157,38 @@ app = BedrockAgentCoreApp()
 # Model configuration
 MODEL_ID = "openai.gpt-oss-20b-1:0"  # gptoss20b model
 
+# Personas accepted by the orchestrator (names kept in order for error messages)
+VALID_PERSONA_NAMES = ("student", "teacher", "administrator")
+VALID_PERSONAS = frozenset(VALID_PERSONA_NAMES)
+
+# AWS region, resolved once per process instead of building a Session per request
+REGION = Session().region_name or os.environ.get("AWS_REGION")
+
+# boto3 Session shared by the per-request memory session managers, so each one
+# builds its clients from already-loaded credentials and service models. A
+# Session is not thread-safe, hence the lock around manager construction.
+memory_boto_session = Session(region_name=REGION)
+memory_boto_session_lock = threading.Lock()
+
 # Global variables for runtime state
+response_cache = ResponseCache()
 memory_id_cache = None
+memory_id_expires_at = 0.0
+memory_id_lock = threading.Lock()
+# How long a memory_id read from SSM/environment is reused before re-reading it
+MEMORY_ID_TTL_SECONDS = 300
 memory_client_cache = None
 
 # ============================================================================
 # CONFIGURATION HELPERS
 # ============================================================================
 
+@functools.lru_cache(maxsize=None)
+def _ssm_client():
+    """Create the SSM client once, on first use, so importing needs no credentials."""
+    return boto3.client("ssm")
+
+
 def get_memory_id_from_ssm(param_name: str = "/app/octank_edu_multi_agent/memory_id") -> str:
     """
     Retrieve memory_id from AWS Systems Manager Parameter Store.
@@ -163,14 +202,14 @@ def get_memory_id_from_ssm(param_name: str = "/app/octank_edu_multi_agent/memory
     Raises:
         Exception: If parameter cannot be retrieved
     """
-    ssm = boto3.client("ssm")
+    ssm = _ssm_client()
     try:
         response = ssm.get_parameter(Name=param_name)
         memory_id = response["Parameter"]["Value"]
-        logger.info(f"Retrieved memory_id from SSM: {memory_id}")
+        logger.info("Retrieved memory_id from SSM: %s", memory_id)
         return memory_id
     except ClientError as e:
-        logger.error(f"Could not retrieve memory_id from SSM: {e}")
+        logger.error("Could not retrieve memory_id from SSM: %s", e)
         raise Exception(f"Could not retrieve memory_id from SSM: {e}")
 
 
@@ -192,32 +231,40 @@ def get_memory_id(payload: Dict[str, Any]) -> str:
     Raises:
         Exception: If memory_id cannot be determined
     """
-    global memory_id_cache
+    global memory_id_cache, memory_id_expires_at
     
     # Check payload first
     if "memory_id" in payload:
         memory_id = payload["memory_id"]
-        logger.info(f"Using memory_id from payload: {memory_id}")
+        logger.info("Using memory_id from payload: %s", memory_id)
         return memory_id
     
-    # Use cached value if available
-    if memory_id_cache:
-        logger.info(f"Using cached memory_id: {memory_id_cache}")
-        return memory_id_cache
-    
-    # Try SSM Parameter Store
-    try:
-        memory_id_cache = get_memory_id_from_ssm()
+    # Use cached value if available and not expired
+    if memory_id_cache and time.monotonic() < memory_id_expires_at:
+        logger.info("Using cached memory_id: %s", memory_id_cache)
         return memory_id_cache
-    except Exception as e:
-        logger.warning(f"Could not get memory_id from SSM: {e}")
     
-    # Try environment variable as fallback
-    memory_id = os.getenv("MEMORY_ID")
-    if memory_id:
-        logger.info(f"Using memory_id from environment: {memory_id}")
-        memory_id_cache = memory_id
-        return memory_id
+    # Single-flight: only one concurrent request resolves the id, the others
+    # wait and reuse its result instead of all calling SSM
+    with memory_id_lock:
+        if memory_id_cache and time.monotonic() < memory_id_expires_at:
+            return memory_id_cache
+        
+        # Try SSM Parameter Store
+        try:
+            memory_id_cache = get_memory_id_from_ssm()
+            memory_id_expires_at = time.monotonic() + MEMORY_ID_TTL_SECONDS
+            return memory_id_cache
+        except Exception as e:
+            logger.warning("Could not get memory_id from SSM: %s", e)
+        
+        # Try environment variable as fallback
+        memory_id = os.getenv("MEMORY_ID")
+        if memory_id:
+            logger.info("Using memory_id from environment: %s", memory_id)
+            memory_id_cache = memory_id
+            memory_id_expires_at = time.monotonic() + MEMORY_ID_TTL_SECONDS
+            return memory_id
     
     raise Exception(
         "memory_id is required but not found in payload, SSM, or environment. "
@@ -226,68 +273,261 @@ def get_memory_id(payload: Dict[str, Any]) -> str:
 
 def get_kb_id_from_ssm():
     param_name = '/app/octank_assistant/agentcore/kb_id'
-    ssm = boto3.client("ssm")
+    ssm = _ssm_client()
     try:
         response = ssm.get_parameter(Name=param_name)
         kb_id = response["Parameter"]["Value"]
-        logger.info(f"Mortgage Assistant runtime - get_kb_id_from_ssm kb_id: {kb_id}")
+        logger.info("Mortgage Assistant runtime - get_kb_id_from_ssm kb_id: %s", kb_id)
         return kb_id
     except ClientError as e:
         raise Exception(f"Could not retrieve kb_id from SSM: {e}")
         
-# Get Cognito token
-token = utils.get_cognito_token()
-
 def create_streamable_http_transport():
+    from mcp.client.streamable_http import streamablehttp_client
+    
+    # Both lookups are cached in utils; the token is refreshed before it expires
     return streamablehttp_client(
         utils.get_ssm_parameter("/app/octank/agentcore/gatewayURL"),
-        headers={"Authorization": f"Bearer {token}"}
+        headers={"Authorization": f"Bearer {utils.get_cognito_token()}"}
     )
 
 mcp_client = MCPClient(create_streamable_http_transport)
 
+# Gateway tool list, reused for MCP_TOOLS_TTL_SECONDS: (monotonic time listed, tools)
+MCP_TOOLS_TTL_SECONDS = 60
+mcp_tools_cache = (0.0, [])
+
+# A hung Gateway must not hold the request; past this the orchestrator runs
+# with the base tools only
+MCP_LIST_TOOLS_TIMEOUT_SECONDS = 2.0
+
+def get_mcp_tools() -> list:
+    """
+    Return the Gateway's MCP tools, listing them again only once the TTL has passed.
+    
+    Must be called inside ``with mcp_client``. The returned tools call back
+    through mcp_client, so they stay valid across sessions.
+    
+    Raises:
+        concurrent.futures.TimeoutError: If the Gateway does not answer within
+            MCP_LIST_TOOLS_TIMEOUT_SECONDS
+    """
+    global mcp_tools_cache
+    
+    listed_at, mcp_tools = mcp_tools_cache
+    if mcp_tools and time.monotonic() - listed_at < MCP_TOOLS_TTL_SECONDS:
+        return mcp_tools
+    
+    # A fresh worker per attempt: a listing abandoned after the timeout keeps
+    # its own thread and never blocks the next request's listing
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcp-list-tools")
+    try:
+        mcp_tools = executor.submit(mcp_client.list_tools_sync).result(
+            timeout=MCP_LIST_TOOLS_TIMEOUT_SECONDS
+        )
+    finally:
+        executor.shutdown(wait=False)
+    mcp_tools_cache = (time.monotonic(), mcp_tools)
+    return mcp_tools
+
+# Gateway tool (Lambda target) that delivers WhatsApp messages. The runtime
+# calls it itself with the final answer, so it is not offered to the model.
+WHATSAPP_TOOL_NAME = "send_whatsapp_message"
+
+def is_whatsapp_tool(tool: Any) -> bool:
+    """Return True for the Gateway's WhatsApp tool (names are prefixed with the target)."""
+    return tool.tool_name.endswith(WHATSAPP_TOOL_NAME)
+
+def get_orchestrator_mcp_tools() -> list:
+    """
+    Return the Gateway tools offered to the orchestrator, or an empty list if
+    they cannot be listed (the orchestrator then runs with its base tools only).
+    
+    Must be called inside ``with mcp_client``.
+    """
+    try:
+        mcp_tools = [tool for tool in get_mcp_tools() if not is_whatsapp_tool(tool)]
+    except Exception as e:
+        logger.warning("MCP tools unavailable, using base tools only: %r", e)
+        return []
+    
+    logger.info("Loaded %s MCP tools from Gateway", len(mcp_tools))
+    return mcp_tools
+
+def send_whatsapp_reply(phone_number: str, message: str) -> bool:
+    """
+    Send the orchestrator's answer to the user through the Gateway WhatsApp tool.
+    
+    Must be called inside ``with mcp_client``. Failures are logged rather than
+    raised so a delivery problem never discards the generated answer.
+    
+    Returns:
+        True if the Gateway reported success
+    """
+    try:
+        whatsapp_tool = next((tool for tool in get_mcp_tools() if is_whatsapp_tool(tool)), None)
+        if whatsapp_tool is None:
+            logger.error("WhatsApp tool not found in Gateway tools")
+            return False
+        
+        result = mcp_client.call_tool_sync(
+            tool_use_id=f"whatsapp-{uuid.uuid4().hex}",
+            name=whatsapp_tool.mcp_tool.name,
+            arguments={"phone_number": phone_number, "message": message}
+        )
+    except Exception as e:
+        logger.error("Error sending WhatsApp reply: %s", e)
+        return False
+    
+    if result["status"] != "success":
+        logger.error("WhatsApp tool returned an error: %s", result["content"])
+        return False
+    
+    logger.info("WhatsApp reply sent to %s", phone_number)
+    return True
+
+def deliver_whatsapp_reply(phone_number: str, message: str) -> bool:
+    """Open an MCP session and send a reply that did not come from the orchestrator."""
+    try:
+        with mcp_client:
+            return send_whatsapp_reply(phone_number, message)
+    except Exception as e:
+        logger.error("Error sending WhatsApp reply: %s", e)
+        return False
+
 # ============================================================================
-# ORCHESTRATOR AGENT CREATION
+# PERSONAL INFO SHORTCUT
 # ============================================================================
 
-def create_orchestrator_agent_runtime(
-    query: str,
-    persona: str,
-    session_manager: AgentCoreMemorySessionManager,
-    persona_id: Optional[str] = None,
-    whatsapp_phone_number: Optional[str] = None
-) -> Any:
+# Questions about what the user told us before ("What is my name?") are
+# answered straight from long-term memory, without an orchestrator LLM call.
+# Matched against the whole normalized query, so a question that asks for
+# anything more ("What is my name and which courses...") goes to the orchestrator.
+PERSONAL_INFO_RE = re.compile(
+    r"(?P<pt>qual (?:é|e) o meu nome|o que eu gosto(?: de estudar)?|quando (?:eu )?prefiro estudar"
+    r"|o que eu (?:te )?(?:disse|falei)(?: antes)?)"
+    r"|(?P<en>what(?:'s| is) my name|what do i like(?: to study)?|when do i (?:prefer|like) to study"
+    r"|what did i tell you(?: before)?)"
+)
+PERSONAL_INFO_NAMESPACES = (
+    "/octank-edu/{actorId}/preferences",
+    "/octank-edu/{actorId}/facts"
+)
+PERSONAL_INFO_TOP_K = 3
+PERSONAL_INFO_MIN_SCORE = 0.7
+PERSONAL_INFO_HEADERS = {
+    "pt": "Aqui está o que eu lembro sobre você:",
+    "en": "Here is what I remember about you:"
+}
+
+
+def memory_record_text(text: str) -> str:
     """
-    Create and invoke the orchestrator agent for runtime deployment.
+    Return the readable part of a long-term memory record.
     
-    This function creates an orchestrator that coordinates between five specialized
-    sub-agents using the "Agents as Tools" pattern. It integrates with AgentCore
-    Memory for conversation context and implements persona-based access control.
+    Preference records are stored as JSON (context, preference, categories);
+    only the preference itself is shown. Fact records are plain text.
+    """
+    try:
+        record = json.loads(text)
+    except ValueError:
+        return text.strip()
+    if isinstance(record, dict) and record.get("preference"):
+        return str(record["preference"]).strip()
+    return text.strip()
+
+
+def answer_personal_info_from_memory(
+    memory_client: MemoryClient,
+    memory_id: str,
+    user_id: str,
+    user_message: str
+) -> Optional[str]:
+    """
+    Answer a personal-info question from the user's long-term memory records.
     
     Args:
-        query: User's question or request
-        persona: User persona type - "student", "teacher", or "administrator"
-        session_manager: AgentCore Memory session manager for context
-        persona_id: Optional persona ID for personalized data
-        whatsapp_phone_number: Optional WhatsApp phone number for message delivery
+        memory_client: AgentCore Memory client
+        memory_id: Memory ID
+        user_id: Actor whose preferences/facts namespaces are searched
+        user_message: User's query
         
     Returns:
-        Agent response object containing the orchestrated answer
-        
-    Raises:
-        ValueError: If persona is invalid
+        Response text, or None when the query is not a personal-info question
+        or nothing relevant is stored (the orchestrator handles it instead)
     """
-    # Validate persona
-    valid_personas = ["student", "teacher", "administrator"]
-    if persona not in valid_personas:
-        raise ValueError(
-            f"Invalid persona '{persona}'. Must be one of: {', '.join(valid_personas)}"
+    match = PERSONAL_INFO_RE.fullmatch(normalize_query(user_message))
+    if match is None:
+        return None
+    
+    # Search the namespaces in parallel
+    with ThreadPoolExecutor(max_workers=len(PERSONAL_INFO_NAMESPACES)) as executor:
+        results = executor.map(
+            lambda namespace: memory_client.retrieve_memories(
+                memory_id=memory_id,
+                namespace=namespace.format(actorId=user_id),
+                query=user_message,
+                top_k=PERSONAL_INFO_TOP_K
+            ),
+            PERSONAL_INFO_NAMESPACES
         )
+        records = [
+            record
+            for records in results
+            for record in records
+            if record.get("score", 0) >= PERSONAL_INFO_MIN_SCORE and record.get("content", {}).get("text")
+        ]
+    
+    # Best matches first, each statement once (both namespaces can hold it)
+    records.sort(key=lambda record: record["score"], reverse=True)
+    memories = list(dict.fromkeys(
+        memory_record_text(record["content"]["text"]) for record in records
+    ))
+    memories = [memory for memory in memories if memory]
     
-    logger.info(f"Creating orchestrator agent - Persona: {persona}, Persona ID: {persona_id}")
+    if not memories:
+        return None
     
-    # Define orchestrator system prompt with memory awareness
-    orchestrator_system_prompt = f"""You are an Educational System Orchestrator for the Octank Educational Multi-Agent System.
+    header = PERSONAL_INFO_HEADERS[match.lastgroup]
+    return "\n".join([header, *(f"- {memory}" for memory in memories)])
+
+
+def save_personal_info_turn(
+    memory_client: MemoryClient,
+    memory_id: str,
+    user_id: str,
+    session_id: str,
+    user_message: str,
+    answer: str
+) -> None:
+    """
+    Record a turn answered by the personal-info shortcut in the session's
+    short-term memory, as the session manager does for orchestrator turns,
+    so the conversation history stays complete.
+    """
+    try:
+        memory_client.create_event(
+            memory_id=memory_id,
+            actor_id=user_id,
+            session_id=session_id,
+            messages=[(user_message, "USER"), (answer, "ASSISTANT")]
+        )
+    except Exception as e:
+        logger.warning("Could not save personal info turn to memory: %s", e)
+
+
+# ============================================================================
+# ORCHESTRATOR AGENT CREATION
+# ============================================================================
+
+# Query sent to the orchestrator: the user's text plus the request context
+CONTEXTUALIZED_QUERY_TEMPLATE = """User Query: {query}
+
+[Context: Persona={persona}, ID={persona_id_label}]
+"""
+
+# Orchestrator system prompt, built once; filled per request with str.format
+ORCHESTRATOR_PROMPT_TEMPLATE = """You are an Educational System Orchestrator for the Octank Educational Multi-Agent System.
 
 Your role is to analyze incoming queries, determine the appropriate specialized agent to handle them, 
 and coordinate responses.
@@ -301,13 +541,13 @@ MEMORY SYSTEM - YOU HAVE ACCESS TO CONVERSATION HISTORY:
 
 CURRENT USER CONTEXT:
 - Persona: {persona}
-- Persona ID: {persona_id or 'Not specified'}
+- Persona ID: {persona_id_label}
 - Memory Enabled: Yes - Use it!
 
 IMPORTANT: When invoking tools, you MUST pass the persona parameter to ensure proper access control.
-- For answer_student_questions: Pass persona="{persona}" and student_id="{persona_id or ''}"
-- For answer_teacher_questions: Pass persona="{persona}" and teacher_id="{persona_id or ''}"
-- For answer_payment_questions: Pass persona="{persona}" and student_id="{persona_id or ''}"
+- For answer_student_questions: Pass persona="{persona}" and student_id="{persona_id}"
+- For answer_teacher_questions: Pass persona="{persona}" and teacher_id="{persona_id}"
+- For answer_payment_questions: Pass persona="{persona}" and student_id="{persona_id}"
 - For answer_admin_questions: Pass persona="{persona}"
 - For answer_general_questions: Pass persona="{persona}"
 
@@ -410,84 +650,196 @@ IMPORTANT GUIDELINES:
 - Leverage memory to provide personalized experiences
 - Be helpful, professional, and encouraging
 
-WHATSAPP INTEGRATION:
-- After generating your response, ALWAYS use send_whatsapp_message to send it to the user
-- Extract the phone number from the context (it will be in whatsapp_phone_number field)
-- Send your complete response as a WhatsApp message
-- Example workflow:
-  1. User asks: "Quais são minhas tarefas?"
-  2. You call answer_student_questions to get the tasks
-  3. You formulate a response: "Suas tarefas pendentes são: Matemática e História"
-  4. You call send_whatsapp_message(phone_number="+5511999999999", message="Suas tarefas pendentes são: Matemática e História")
-
 Your goal is to provide seamless coordination between specialized agents while maintaining
-a unified, conversational experience with memory-enhanced personalization, and delivering
-responses via WhatsApp.
+a unified, conversational experience with memory-enhanced personalization.
 """
+
+@functools.lru_cache(maxsize=None)
+def get_sub_agent_tools() -> tuple:
+    """
+    Import the sub-agent modules on first use and return their tools.
     
-    # Register all sub-agent tools
-    base_tools = [
-        answer_student_questions,
-        answer_teacher_questions,
-        answer_payment_questions,
-        answer_admin_questions,
-        answer_general_questions,
-        retrieve
-        #send_whatsapp_message  # Tool para enviar mensagens no WhatsApp
-    ]
+    Returns:
+        Tuple with the five sub-agent tools followed by the retrieve tool
+    """
+    from strands_tools import retrieve
     
-    logger.info(f"Registered {len(base_tools)} base tools (5 sub-agents)")
+    sub_agent_tools = tuple(
+        getattr(importlib.import_module(module_name), tool_name)
+        for module_name, tool_name in SUB_AGENT_TOOLS
+    )
+    logger.info("Loaded %s sub-agent tools", len(sub_agent_tools))
+    return sub_agent_tools + (retrieve,)
+
+
+def prepare_orchestrator(query: str, persona: str, persona_id: Optional[str]) -> tuple:
+    """
+    Validate the persona and build the system prompt and base tools for an orchestrator.
     
-    # Prepare contextualized query BEFORE creating the agent
-    whatsapp_context = f", WhatsApp Phone={whatsapp_phone_number}" if whatsapp_phone_number else ""
-    contextualized_query = f"""User Query: {query}
+    Returns:
+        Tuple of (system prompt, tuple of base tools)
+        
+    Raises:
+        ValueError: If persona is invalid
+    """
+    # Validate persona
+    if persona not in VALID_PERSONAS:
+        raise ValueError(
+            f"Invalid persona '{persona}'. Must be one of: {', '.join(VALID_PERSONA_NAMES)}"
+        )
+    
+    logger.info("Creating orchestrator agent - Persona: %s, Persona ID: %s", persona, persona_id)
+    
+    # Fill in the orchestrator system prompt (memory aware) for this persona
+    orchestrator_system_prompt = ORCHESTRATOR_PROMPT_TEMPLATE.format(
+        persona=persona,
+        persona_id=persona_id or '',
+        persona_id_label=persona_id or 'Not specified'
+    )
+    
+    # Register all sub-agent tools (shared, immutable tuple)
+    base_tools = get_sub_agent_tools()
+    #base_tools.append(send_whatsapp_message)  # Tool para enviar mensagens no WhatsApp
+    
+    logger.info("Registered %s base tools (5 sub-agents)", len(base_tools))
+    
+    logger.info("Processing query: %.100s...", query)
+    
+    return orchestrator_system_prompt, base_tools
 
-[Context: Persona={persona}, ID={persona_id or 'Not specified'}{whatsapp_context}]
-"""
+
+def create_orchestrator_agent_runtime(
+    query: str,
+    persona: str,
+    session_manager: AgentCoreMemorySessionManager,
+    persona_id: Optional[str] = None,
+    whatsapp_phone_number: Optional[str] = None
+) -> Any:
+    """
+    Create and invoke the orchestrator agent for runtime deployment.
+    
+    This function creates an orchestrator that coordinates between five specialized
+    sub-agents using the "Agents as Tools" pattern. It integrates with AgentCore
+    Memory for conversation context and implements persona-based access control.
     
-    logger.info(f"Processing query: {query[:100]}...")
+    Args:
+        query: User's question or request
+        persona: User persona type - "student", "teacher", or "administrator"
+        session_manager: AgentCore Memory session manager for context
+        persona_id: Optional persona ID for personalized data
+        whatsapp_phone_number: Optional WhatsApp number; the answer is sent there
+            through the Gateway once it has been generated
+        
+    Returns:
+        Agent response object containing the orchestrated answer
+        
+    Raises:
+        ValueError: If persona is invalid
+    """
+    orchestrator_system_prompt, base_tools = prepare_orchestrator(query, persona, persona_id)
     
     # Create and invoke orchestrator WITHIN MCP context
     with mcp_client:
+        # Prepare contextualized query BEFORE creating the agent
+        contextualized_query = CONTEXTUALIZED_QUERY_TEMPLATE.format(
+            query=query,
+            persona=persona,
+            persona_id_label=persona_id or 'Not specified'
+        )
+        
+        # Base tools plus whatever the Gateway offers (nothing if it is unavailable)
+        all_tools = [*base_tools, *get_orchestrator_mcp_tools()]
+        
+        orchestrator = Agent(
+            model=MODEL_ID,
+            system_prompt=orchestrator_system_prompt,
+            tools=all_tools,
+            session_manager=session_manager  # Enable memory
+        )
+        logger.info("Orchestrator agent created successfully with %s tools", len(all_tools))
+        
+        # Invoke orchestrator (WITHIN MCP context)
+        response = orchestrator(contextualized_query)
+        logger.info("Orchestrator successfully processed query")
+        
+        if whatsapp_phone_number:
+            send_whatsapp_reply(whatsapp_phone_number, str(response))
+        
+        return response
+
+
+def stream_orchestrator_agent_runtime(
+    query: str,
+    persona: str,
+    session_manager: AgentCoreMemorySessionManager,
+    persona_id: Optional[str] = None,
+    whatsapp_phone_number: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of create_orchestrator_agent_runtime.
+    
+    The persona is validated immediately; the returned async generator then
+    yields the orchestrator's text as the model produces it, keeping the MCP
+    session open until the stream finishes.
+    
+    Raises:
+        ValueError: If persona is invalid
+    """
+    orchestrator_system_prompt, base_tools = prepare_orchestrator(query, persona, persona_id)
+    
+    async def stream_response():
+        # Opening and closing the MCP session, listing the Gateway tools and
+        # sending the WhatsApp reply all block on network I/O, so they run in
+        # worker threads instead of stalling the event loop
+        await asyncio.to_thread(mcp_client.start)
         try:
-            # Get MCP tools from Gateway
-            mcp_tools = mcp_client.list_tools_sync()
-            all_tools = base_tools + mcp_tools
-            logger.info(f"Added {len(mcp_tools)} MCP tools from Gateway. Total tools: {len(all_tools)}")
-            
-            # Create orchestrator with all tools (base + MCP)
-            orchestrator = Agent(
-                model=MODEL_ID,
-                system_prompt=orchestrator_system_prompt,
-                tools=all_tools,
-                session_manager=session_manager  # Enable memory
+            contextualized_query = CONTEXTUALIZED_QUERY_TEMPLATE.format(
+                query=query,
+                persona=persona,
+                persona_id_label=persona_id or 'Not specified'
             )
-            logger.info("Orchestrator agent created successfully with memory and MCP tools")
-            
-            # Invoke orchestrator (WITHIN MCP context)
-            response = orchestrator(contextualized_query)
-            logger.info("Orchestrator successfully processed query")
-            
-            return response
             
-        except Exception as e:
-            logger.error(f"Error with MCP tools: {str(e)}")
-            logger.info("Falling back to base tools only")
+            mcp_tools = await asyncio.to_thread(get_orchestrator_mcp_tools)
             
-            # Fallback: Create orchestrator without MCP tools
-            orchestrator = Agent(
+            # Attaching the session manager reads/creates the session and agent
+            # in AgentCore Memory, so the Agent is built off the loop as well
+            orchestrator = await asyncio.to_thread(
+                Agent,
                 model=MODEL_ID,
                 system_prompt=orchestrator_system_prompt,
-                tools=base_tools,
+                tools=[*base_tools, *mcp_tools],
                 session_manager=session_manager  # Enable memory
             )
-            logger.info("Orchestrator agent created successfully with memory (fallback mode)")
+            logger.info("Orchestrator agent created successfully, streaming response")
+            
+            parts = []
+            async for event in orchestrator.stream_async(contextualized_query):
+                if "data" in event:
+                    parts.append(event["data"])
+                    yield event["data"]
             
-            # Invoke orchestrator (fallback)
-            response = orchestrator(contextualized_query)
-            logger.info("Orchestrator successfully processed query (fallback)")
+            logger.info("Orchestrator successfully streamed query")
             
-            return response
+            if whatsapp_phone_number:
+                await asyncio.to_thread(send_whatsapp_reply, whatsapp_phone_number, "".join(parts))
+        finally:
+            await asyncio.to_thread(mcp_client.stop, None, None, None)
+    
+    return stream_response()
+
+
+async def stream_complete_response(response: str) -> AsyncIterator[str]:
+    """Stream an answer that is already complete (cache or memory) as a single chunk."""
+    yield response
+
+
+async def cache_streamed_response(chunks: AsyncIterator[str], cache_key: tuple) -> AsyncIterator[str]:
+    """Pass streamed chunks through and store the full text in the response cache."""
+    parts = []
+    async for chunk in chunks:
+        parts.append(chunk)
+        yield chunk
+    response_cache.put(cache_key, "".join(parts))
 
 
 # ============================================================================
@@ -508,12 +860,14 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
         - user_id (required): Unique user identifier
         - persona_id (optional): Persona-specific ID (student_id, teacher_id, etc.)
         - memory_id (optional): Memory ID (can also be configured in SSM)
+        - stream (optional): If true, the response text is streamed as it is generated
     
     Context Parameters:
         - session_id (required): Session identifier for conversation continuity
     
     Returns:
-        Dictionary with 'result' key containing the agent's response message
+        Dictionary with 'result' key containing the agent's response message,
+        or an async generator of text chunks when 'stream' is requested
         
     Raises:
         Exception: If required parameters are missing or processing fails
@@ -541,6 +895,12 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if not persona:
         raise Exception("Payload must include 'persona' parameter (student/teacher/administrator)")
     
+    # Validate persona before any shortcut (cache, memory) can answer
+    if persona not in VALID_PERSONAS:
+        raise ValueError(
+            f"Invalid persona '{persona}'. Must be one of: {', '.join(VALID_PERSONA_NAMES)}"
+        )
+    
     # Extract user_id (required)
     user_id = payload.get("user_id")
     if not user_id:
@@ -557,25 +917,39 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
     if not session_id:
         raise Exception("Context must include 'session_id'")
     
-    # Get AWS region
-    boto_session = Session()
-    region = boto_session.region_name
+    region = REGION
+    
+    logger.info("Orchestrator Runtime - Entrypoint invoked")
+    logger.info("Region: %s", region)
+    logger.info("User message: %s", user_message)
+    logger.info("Persona: %s", persona)
+    logger.info("User ID: %s", user_id)
+    logger.info("Persona ID: %s", persona_id)
+    logger.info("Session ID: %s", session_id)
+    logger.info("WhatsApp Phone: %s", whatsapp_phone_number)
     
-    logger.info(f"Orchestrator Runtime - Entrypoint invoked")
-    logger.info(f"Region: {region}")
-    logger.info(f"User message: {user_message}")
-    logger.info(f"Persona: {persona}")
-    logger.info(f"User ID: {user_id}")
-    logger.info(f"Persona ID: {persona_id}")
-    logger.info(f"Session ID: {session_id}")
-    logger.info(f"WhatsApp Phone: {whatsapp_phone_number}")
+    # Serve repeated questions from the response cache (opt-in, see response_cache.py)
+    cache_key = (user_id, persona, persona_id, normalize_query(user_message))
+    cached_response = response_cache.get(cache_key)
+    if cached_response is not None:
+        logger.info("Returning cached orchestrator response")
+        if whatsapp_phone_number:
+            deliver_whatsapp_reply(whatsapp_phone_number, cached_response)
+        # Streaming clients always receive a stream
+        if payload.get("stream"):
+            return stream_complete_response(cached_response)
+        return {
+            "result": cached_response,
+            "session_id": session_id,
+            "persona": persona
+        }
     
     # Get memory_id (from payload, SSM, or environment)
     try:
         memory_id = get_memory_id(payload)
-        logger.info(f"Using memory_id: {memory_id}")
+        logger.info("Using memory_id: %s", memory_id)
     except Exception as e:
-        logger.error(f"Failed to get memory_id: {e}")
+        logger.error("Failed to get memory_id: %s", e)
         raise
     
     # Initialize memory client if not already initialized
@@ -583,10 +957,35 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
         memory_client_cache = MemoryClient(region_name=region)
         logger.info("Memory client initialized")
     
+    # Personal-info questions are answered from memory when it has the answer
+    try:
+        memory_answer = answer_personal_info_from_memory(
+            memory_client_cache, memory_id, user_id, user_message
+        )
+    except Exception as e:
+        logger.warning("Personal info shortcut failed, using orchestrator: %s", e)
+        memory_answer = None
+    
+    if memory_answer is not None:
+        logger.info("Answered personal info query from memory")
+        save_personal_info_turn(
+            memory_client_cache, memory_id, user_id, session_id, user_message, memory_answer
+        )
+        if whatsapp_phone_number:
+            deliver_whatsapp_reply(whatsapp_phone_number, memory_answer)
+        if payload.get("stream"):
+            return stream_complete_response(memory_answer)
+        return {
+            "result": memory_answer,
+            "session_id": session_id,
+            "persona": persona
+        }
+    
     # Configure AgentCore Memory with leading slash
     # Pattern: /app_name/{actorId}/namespace
     # Using placeholders {actorId} and {sessionId}
     # Configure AgentCore Memory following official example (without leading slash)
+    # The session manager queries these namespaces concurrently (bedrock-agentcore 1.0.7+)
     memory_config = AgentCoreMemoryConfig(
         memory_id=memory_id,
         session_id=session_id,
@@ -595,29 +994,46 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
             # Strategy 1: User preferences (long-term memory - cross-session)
             "/octank-edu/{actorId}/preferences": RetrievalConfig(
                 top_k=5,
-                relevance_score=0.7
+                relevance_score=0.75
             ),
             # Strategy 2: User facts (long-term memory - cross-session)
             "/octank-edu/{actorId}/facts": RetrievalConfig(
                 top_k=5,
-                relevance_score=0.7
+                relevance_score=0.75
             ),
             # Strategy 3: Current session (short-term memory)
+            # Fewer, closer matches: the recent turns are already in the
+            # conversation, so loosely related summaries mostly add prompt tokens
             "/octank-edu/{actorId}/{sessionId}": RetrievalConfig(
-                top_k=5,
-                relevance_score=0.7
+                top_k=3,
+                relevance_score=0.8
             )
         }
     )
     
-    # Create AgentCore session manager
-    session_manager = AgentCoreMemorySessionManager(
-        memory_config,
-        region_name=region
-    )
+    # Create AgentCore session manager. It is built per request (a manager
+    # accepts one Agent per session), but on the shared boto3 Session.
+    with memory_boto_session_lock:
+        session_manager = AgentCoreMemorySessionManager(
+            memory_config,
+            region_name=region,
+            boto_session=memory_boto_session
+        )
     
     logger.info("AgentCore Memory session manager created")
     
+    # Streamed responses (payload "stream": true) are sent as they are generated
+    if payload.get("stream"):
+        logger.info("Creating streaming orchestrator agent")
+        chunks = stream_orchestrator_agent_runtime(
+            query=user_message,
+            persona=persona,
+            session_manager=session_manager,
+            persona_id=persona_id,
+            whatsapp_phone_number=whatsapp_phone_number
+        )
+        return cache_streamed_response(chunks, cache_key)
+    
     # Create and invoke orchestrator agent
     try:
         logger.info("Creating orchestrator agent")
@@ -633,6 +1049,7 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
         response_message = result.message if hasattr(result, 'message') else str(result)
         
         logger.info("Orchestrator successfully processed request")
+        response_cache.put(cache_key, response_message)
         
         return {
             "result": response_message,
@@ -641,7 +1058,7 @@ def invoke(payload: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error in orchestrator processing: {str(e)}")
+        logger.error("Error in orchestrator processing: %s", e)
         raise
 
 
@@ -0,0 +1,73 @@
+"""Opt-in cache for final agent answers.
+
+Repeated questions (same persona, same ids, same wording) otherwise pay for a
+full model round trip every time. Queries are normalized (case, whitespace and
+trailing punctuation) and matched exactly; entries expire after a TTL and the
+least recently used entry is evicted once the cache is full.
+
+The cache is disabled unless RESPONSE_CACHE_TTL_SECONDS is set to a positive
+number, because a cached answer skips the agent entirely: nothing is written to
+AgentCore Memory and the mock data is not regenerated for that request.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+# 0 (the default) disables caching
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "0"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " ?!.;"
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, collapse whitespace and drop trailing punctuation."""
+    return _WHITESPACE_RE.sub(" ", query).strip(_TRAILING_PUNCTUATION).casefold()
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU map from a request key to a response string."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """Return the cached response for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: Hashable, response: str) -> None:
+        """Store response under key, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
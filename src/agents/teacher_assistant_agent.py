@@ -4,76 +4,20 @@ This agent is exposed as a tool that can be invoked by the orchestrator.
 It returns dummy data for demonstration purposes.
 """
 
-from strands import Agent, tool
-from typing import Dict, Any
+import re
+from operator import attrgetter
+from typing import List
 
+from strands import tool
+
+from agent_pool import ThreadLocalAgent
 from mock_data_generator import generate_teacher_data
+from models.core import LowPerformingStudent, PendingTask, TeacherCourseMetrics
+from response_cache import ResponseCache, normalize_query
 
+_response_cache = ResponseCache()
 
-@tool
-def answer_teacher_questions(query: str, teacher_id: str = None, persona: str = "teacher") -> str:
-    """Tool that handles teacher course management questions using a specialized agent.
-    
-    This tool provides information about:
-    - Course metrics (student counts, overdue tasks)
-    - Pending tasks from students
-    - Low-performing students (grade < 5.0)
-    - Course subjects taught
-    
-    Args:
-        query: The teacher's question
-        teacher_id: Optional teacher ID for personalized data
-        persona: The persona type making the request (default: "teacher")
-    
-    Returns:
-        String response from the teacher assistant agent
-    """
-    
-    # Validate persona - only teachers and administrators should access this tool
-    if persona not in ["teacher", "administrator"]:
-        return f"Access denied: This tool is only available for teacher and administrator personas. Current persona: {persona}"
-    
-    # Generate mock teacher data scoped to the persona
-    teacher_data = generate_teacher_data(teacher_id)
-    
-    # Format mock data for context
-    mock_data = {
-        "teacher_id": teacher_data.teacher_id,
-        "teacher_name": teacher_data.teacher_name,
-        "courses": [
-            {
-                "course_id": course.course_id,
-                "course_name": course.course_name,
-                "student_count": course.student_count,
-                "overdue_tasks": course.overdue_tasks
-            }
-            for course in teacher_data.courses
-        ],
-        "pending_tasks": [
-            {
-                "task_id": task.task_id,
-                "course_name": task.course_name,
-                "course_id": task.course_id,
-                "due_date": task.due_date
-            }
-            for task in teacher_data.pending_tasks
-        ],
-        "low_performers": [
-            {
-                "student_id": lp.student_id,
-                "student_name": lp.student_name,
-                "course_name": lp.course_name,
-                "course_id": lp.course_id,
-                "grade": lp.grade
-            }
-            for lp in teacher_data.low_performers
-        ]
-    }
-    
-    # Create the teacher assistant agent
-    teacher_agent = Agent(
-        model="openai.gpt-oss-20b-1:0",
-        system_prompt="""You are a Teacher Assistant that helps teachers manage their courses.
+_SYSTEM_PROMPT = """You are a Teacher Assistant that helps teachers manage their courses.
 
 You can provide information about:
 - Course metrics (student counts, overdue tasks)
@@ -101,66 +45,131 @@ When discussing course metrics:
 - Suggest areas for improvement
 - Celebrate successes
 """
-    )
+
+# Personas allowed to use this tool
+_ALLOWED_PERSONAS = frozenset({"teacher", "administrator"})
+
+# Requests that only ask to list one part of the teacher data, matched against
+# the whole normalized query (so "which of my courses..." still goes to the LLM)
+_LIST_VERB = r"(?:list|show|liste|listar|mostre|mostrar)(?: me)?"
+_LIST_COURSES_RE = re.compile(
+    rf"(?:{_LIST_VERB} )?(?:(?:all |the |my |os |meus )*)(?:courses|cursos)"
+)
+_LIST_TASKS_RE = re.compile(
+    rf"(?:{_LIST_VERB} )?(?:(?:all |the |my |as )*)(?:pending )?(?:tasks|tarefas)(?: pendentes)?"
+)
+_LIST_LOW_PERFORMERS_RE = re.compile(
+    rf"(?:{_LIST_VERB} )?(?:(?:all |the |my |os )*)"
+    r"(?:(?:low[- ]performing|struggling) students|alunos com (?:notas baixas|baixo desempenho))"
+)
+
+# Row format for _format_low_performers and the fields that fill it, in order
+_LOW_PERFORMER_FMT = "  - %s (%s): %s - Grade: %.1f/10.0 ⚠️"
+_low_performer_fields = attrgetter("student_name", "student_id", "course_name", "grade")
+
+# One teacher assistant agent per worker thread, reused across calls
+_teacher_agents = ThreadLocalAgent(
+    model="openai.gpt-oss-20b-1:0",
+    system_prompt=_SYSTEM_PROMPT
+)
+
+
+@tool
+def answer_teacher_questions(query: str, teacher_id: str = None, persona: str = "teacher") -> str:
+    """Tool that handles teacher course management questions using a specialized agent.
+    
+    This tool provides information about:
+    - Course metrics (student counts, overdue tasks)
+    - Pending tasks from students
+    - Low-performing students (grade < 5.0)
+    - Course subjects taught
+    
+    Args:
+        query: The teacher's question
+        teacher_id: Optional teacher ID for personalized data
+        persona: The persona type making the request (default: "teacher")
+    
+    Returns:
+        String response from the teacher assistant agent
+    """
+    
+    # Validate persona - only teachers and administrators should access this tool
+    if persona not in _ALLOWED_PERSONAS:
+        return f"Access denied: This tool is only available for teacher and administrator personas. Current persona: {persona}"
+    
+    normalized_query = normalize_query(query)
+    cache_key = (persona, teacher_id, normalized_query)
+    cached_response = _response_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+    
+    # Generate mock teacher data scoped to the persona
+    teacher_data = generate_teacher_data(teacher_id)
+    
+    # Plain listing requests are answered with the formatted data, no LLM call
+    for pattern, title, formatter, field in _LISTING_QUERIES:
+        if pattern.fullmatch(normalized_query):
+            return f"{title}:\n{formatter(getattr(teacher_data, field))}"
+    
+    teacher_agent = _teacher_agents.get()
     
     # Inject mock data into the query context with persona information
     context = f"""Mock Teacher Data for {teacher_data.teacher_name} (ID: {teacher_data.teacher_id}):
 [Requesting Persona: {persona}]
 
 Courses Taught:
-{_format_courses(mock_data['courses'])}
+{_format_courses(teacher_data.courses)}
 
 Pending Tasks from Students:
-{_format_pending_tasks(mock_data['pending_tasks'])}
+{_format_pending_tasks(teacher_data.pending_tasks)}
 
 Low-Performing Students (grade < 5.0):
-{_format_low_performers(mock_data['low_performers'])}
+{_format_low_performers(teacher_data.low_performers)}
 
 Teacher Query: {query}
 """
     
     # Get response from the agent
-    response = teacher_agent(context)
+    response = str(teacher_agent(context))
+    _response_cache.put(cache_key, response)
     
-    return str(response)
+    return response
 
 
-def _format_courses(courses: list) -> str:
+def _format_courses(courses: List[TeacherCourseMetrics]) -> str:
     """Format course list for display."""
     if not courses:
         return "No courses assigned"
     
-    lines = []
-    for course in courses:
-        lines.append(
-            f"  - {course['course_name']} ({course['course_id']}): "
-            f"{course['student_count']} students, {course['overdue_tasks']} overdue tasks"
-        )
-    return "\n".join(lines)
+    return "\n".join(
+        f"  - {course.course_name} ({course.course_id}): "
+        f"{course.student_count} students, {course.overdue_tasks} overdue tasks"
+        for course in courses
+    )
 
 
-def _format_pending_tasks(tasks: list) -> str:
+def _format_pending_tasks(tasks: List[PendingTask]) -> str:
     """Format pending tasks list for display."""
     if not tasks:
         return "No pending tasks from students"
     
-    lines = []
-    for task in tasks:
-        lines.append(
-            f"  - {task['course_name']}: Task {task['task_id']} (Due: {task['due_date']})"
-        )
-    return "\n".join(lines)
+    return "\n".join(
+        f"  - {task.course_name}: Task {task.task_id} (Due: {task.due_date})"
+        for task in tasks
+    )
 
 
-def _format_low_performers(low_performers: list) -> str:
+def _format_low_performers(low_performers: List[LowPerformingStudent]) -> str:
     """Format low-performing students list for display."""
     if not low_performers:
         return "No students with grades below 5.0 - excellent work!"
     
-    lines = []
-    for lp in low_performers:
-        lines.append(
-            f"  - {lp['student_name']} ({lp['student_id']}): "
-            f"{lp['course_name']} - Grade: {lp['grade']:.1f}/10.0 ⚠️"
-        )
-    return "\n".join(lines)
+    return "\n".join(_LOW_PERFORMER_FMT % _low_performer_fields(lp) for lp in low_performers)
+
+
+# (pattern, title, formatter, TeacherData field) for the listing shortcut
+_LISTING_QUERIES = (
+    (_LIST_COURSES_RE, "Courses Taught", _format_courses, "courses"),
+    (_LIST_TASKS_RE, "Pending Tasks from Students", _format_pending_tasks, "pending_tasks"),
+    (_LIST_LOW_PERFORMERS_RE, "Low-Performing Students (grade < 5.0)", _format_low_performers, "low_performers"),
+)
@@ -4,75 +4,17 @@ This agent is exposed as a tool that can be invoked by the orchestrator.
 It returns dummy data for demonstration purposes.
 """
 
-from strands import Agent, tool
-from typing import Dict, Any
+from collections import defaultdict
+from typing import Sequence
 
+from strands import tool
+
+from agent_pool import ThreadLocalAgent
 from mock_data_generator import generate_admin_data
+from models.core import LowPerformingStudent, PaymentInfo, TeacherMetrics
 
 
-@tool
-def answer_admin_questions(query: str, persona: str = "administrator") -> str:
-    """Tool that handles administrative operational questions using a specialized agent.
-    
-    This tool provides information about:
-    - Delinquent student payments
-    - Low-performing students across all courses
-    - Teacher performance metrics
-    - Operational insights and recommendations
-    
-    Args:
-        query: The administrator's question
-        persona: The persona type making the request (default: "administrator")
-    
-    Returns:
-        String response from the virtual secretary agent
-    """
-    
-    # Validate persona - only administrators should access this tool
-    if persona != "administrator":
-        return f"Access denied: This tool is only available for administrator personas. Current persona: {persona}"
-    
-    # Generate mock administrator data (full system scope)
-    admin_data = generate_admin_data()
-    
-    # Format mock data for context
-    mock_data = {
-        "delinquent_students": [
-            {
-                "student_id": ds.student_id,
-                "student_name": ds.student_name,
-                "unpaid_months": ds.unpaid_months,
-                "total_due": ds.amount_due
-            }
-            for ds in admin_data.delinquent_students
-        ],
-        "low_performing_students": [
-            {
-                "student_id": lp.student_id,
-                "student_name": lp.student_name,
-                "course_name": lp.course_name,
-                "course_id": lp.course_id,
-                "grade": lp.grade
-            }
-            for lp in admin_data.low_performing_students
-        ],
-        "teacher_performance": [
-            {
-                "teacher_id": tp.teacher_id,
-                "teacher_name": tp.teacher_name,
-                "classes_taught_last_week": tp.classes_taught_last_week,
-                "grades_published_last_week": tp.grades_published_last_week,
-                "below_average_percentage": tp.below_average_percentage,
-                "insights": tp.insights
-            }
-            for tp in admin_data.teacher_performance
-        ]
-    }
-    
-    # Create the virtual secretary agent
-    admin_agent = Agent(
-        model="openai.gpt-oss-20b-1:0",
-        system_prompt="""You are a Virtual Secretary that provides operational reports to administrators.
+_SYSTEM_PROMPT = """You are a Virtual Secretary that provides operational reports to administrators.
 
 You can provide information about:
 - Delinquent student payments
@@ -108,7 +50,41 @@ When providing operational insights:
 - Prioritize action items
 - Provide strategic recommendations
 """
-    )
+
+# One virtual secretary agent per worker thread, reused across calls
+_admin_agents = ThreadLocalAgent(
+    model="openai.gpt-oss-20b-1:0",
+    system_prompt=_SYSTEM_PROMPT
+)
+
+
+@tool
+def answer_admin_questions(query: str, persona: str = "administrator") -> str:
+    """Tool that handles administrative operational questions using a specialized agent.
+    
+    This tool provides information about:
+    - Delinquent student payments
+    - Low-performing students across all courses
+    - Teacher performance metrics
+    - Operational insights and recommendations
+    
+    Args:
+        query: The administrator's question
+        persona: The persona type making the request (default: "administrator")
+    
+    Returns:
+        String response from the virtual secretary agent
+    """
+    
+    # Validate persona - only administrators should access this tool
+    if persona != "administrator":
+        return f"Access denied: This tool is only available for administrator personas. Current persona: {persona}"
+    
+    # Generate mock administrator data (full system scope)
+    admin_data = generate_admin_data()
+    
+    # Reuse this thread's virtual secretary agent
+    admin_agent = _admin_agents.get()
     
     # Inject mock data into the query context with persona information
     context = f"""Mock Administrative Data:
@@ -116,13 +92,13 @@ When providing operational insights:
 [Access Level: Full System Scope]
 
 === DELINQUENT STUDENTS (Payment Issues) ===
-{_format_delinquent_students(mock_data['delinquent_students'])}
+{_format_delinquent_students(admin_data.delinquent_students)}
 
 === LOW-PERFORMING STUDENTS (Academic Issues) ===
-{_format_low_performing_students(mock_data['low_performing_students'])}
+{_format_low_performing_students(admin_data.low_performing_students)}
 
 === TEACHER PERFORMANCE METRICS ===
-{_format_teacher_performance(mock_data['teacher_performance'])}
+{_format_teacher_performance(admin_data.teacher_performance)}
 
 Administrator Query: {query}
 """
@@ -133,94 +109,87 @@ Administrator Query: {query}
     return str(response)
 
 
-def _format_delinquent_students(delinquent_students: list) -> str:
+def _format_delinquent_students(delinquent_students: Sequence[PaymentInfo]) -> str:
     """Format delinquent students list for display."""
     if not delinquent_students:
         return "No delinquent students - all payments are current!"
     
-    lines = []
-    total_outstanding = 0.0
+    total_outstanding = sum(ds.amount_due for ds in delinquent_students)
     
-    for ds in delinquent_students:
-        lines.append(
-            f"  ⚠️ {ds['student_name']} ({ds['student_id']})"
-        )
-        lines.append(
-            f"     Unpaid Months: {', '.join(ds['unpaid_months'])}"
-        )
-        lines.append(
-            f"     Amount Due: ${ds['total_due']:.2f}"
-        )
-        lines.append("")
-        total_outstanding += ds['total_due']
-    
-    lines.append(f"TOTAL OUTSTANDING: ${total_outstanding:.2f}")
-    lines.append(f"Number of Delinquent Students: {len(delinquent_students)}")
-    
-    return "\n".join(lines)
+    return "".join(
+        f"  ⚠️ {ds.student_name} ({ds.student_id})\n"
+        f"     Unpaid Months: {', '.join(ds.unpaid_months)}\n"
+        f"     Amount Due: ${ds.amount_due:.2f}\n\n"
+        for ds in delinquent_students
+    ) + (
+        f"TOTAL OUTSTANDING: ${total_outstanding:.2f}\n"
+        f"Number of Delinquent Students: {len(delinquent_students)}"
+    )
 
 
-def _format_low_performing_students(low_performers: list) -> str:
+def _format_low_performing_students(low_performers: Sequence[LowPerformingStudent]) -> str:
     """Format low-performing students list for display."""
     if not low_performers:
         return "No students with grades below 5.0 - excellent academic performance!"
     
-    lines = []
-    
-    # Group by student
-    student_courses = {}
+    # Group (course, grade) pairs by student
+    student_courses = defaultdict(list)
     for lp in low_performers:
-        student_key = f"{lp['student_name']} ({lp['student_id']})"
-        if student_key not in student_courses:
-            student_courses[student_key] = []
-        student_courses[student_key].append({
-            'course': lp['course_name'],
-            'grade': lp['grade']
-        })
-    
-    for student, courses in student_courses.items():
-        lines.append(f"  ⚠️ {student}")
-        for course_info in courses:
-            lines.append(
-                f"     - {course_info['course']}: {course_info['grade']:.1f}/10.0"
-            )
-        lines.append("")
-    
-    lines.append(f"Total Students Needing Support: {len(student_courses)}")
-    lines.append(f"Total Course Failures: {len(low_performers)}")
+        student_courses[f"{lp.student_name} ({lp.student_id})"].append(
+            (lp.course_name, lp.grade)
+        )
     
-    return "\n".join(lines)
+    return "".join(
+        f"  ⚠️ {student}\n"
+        + "".join(
+            f"     - {course}: {grade:.1f}/10.0\n"
+            for course, grade in courses
+        )
+        + "\n"
+        for student, courses in student_courses.items()
+    ) + (
+        f"Total Students Needing Support: {len(student_courses)}\n"
+        f"Total Course Failures: {len(low_performers)}"
+    )
 
 
-def _format_teacher_performance(teacher_metrics: list) -> str:
+def _format_teacher_performance(teacher_metrics: Sequence[TeacherMetrics]) -> str:
     """Format teacher performance metrics for display."""
     if not teacher_metrics:
         return "No teacher performance data available"
     
-    lines = []
-    
+    # Format each teacher and accumulate the summary sums in the same pass
+    blocks = []
+    sum_classes = sum_grades = sum_below = 0
     for tm in teacher_metrics:
-        lines.append(f"  📊 {tm['teacher_name']} ({tm['teacher_id']})")
-        lines.append(f"     Classes Taught (Last Week): {tm['classes_taught_last_week']}")
-        lines.append(f"     Grades Published (Last Week): {tm['grades_published_last_week']}")
-        lines.append(f"     Students Below Average: {tm['below_average_percentage']:.1f}%")
-        
-        if tm['insights']:
-            lines.append(f"     Insights:")
-            for insight in tm['insights']:
-                lines.append(f"       • {insight}")
-        
-        lines.append("")
-    
-    # Calculate summary statistics
-    avg_classes = sum(tm['classes_taught_last_week'] for tm in teacher_metrics) / len(teacher_metrics)
-    avg_grades = sum(tm['grades_published_last_week'] for tm in teacher_metrics) / len(teacher_metrics)
-    avg_below = sum(tm['below_average_percentage'] for tm in teacher_metrics) / len(teacher_metrics)
-    
-    lines.append("=== SUMMARY STATISTICS ===")
-    lines.append(f"Average Classes Taught: {avg_classes:.1f}")
-    lines.append(f"Average Grades Published: {avg_grades:.1f}")
-    lines.append(f"Average Below-Average Rate: {avg_below:.1f}%")
-    lines.append(f"Total Teachers: {len(teacher_metrics)}")
-    
-    return "\n".join(lines)
+        classes = tm.classes_taught_last_week
+        grades = tm.grades_published_last_week
+        below = tm.below_average_percentage
+        sum_classes += classes
+        sum_grades += grades
+        sum_below += below
+        blocks.append(
+            f"  📊 {tm.teacher_name} ({tm.teacher_id})\n"
+            f"     Classes Taught (Last Week): {classes}\n"
+            f"     Grades Published (Last Week): {grades}\n"
+            f"     Students Below Average: {below:.1f}%\n"
+            + _format_insights(tm.insights)
+            + "\n"
+        )
+    
+    num_teachers = len(teacher_metrics)
+    
+    return "".join(blocks) + (
+        "=== SUMMARY STATISTICS ===\n"
+        f"Average Classes Taught: {sum_classes / num_teachers:.1f}\n"
+        f"Average Grades Published: {sum_grades / num_teachers:.1f}\n"
+        f"Average Below-Average Rate: {sum_below / num_teachers:.1f}%\n"
+        f"Total Teachers: {num_teachers}"
+    )
+
+
+def _format_insights(insights: Sequence[str]) -> str:
+    """Format a teacher's insights as indented bullets (empty if there are none)."""
+    if not insights:
+        return ""
+    return "     Insights:\n" + "".join(f"       • {insight}\n" for insight in insights)
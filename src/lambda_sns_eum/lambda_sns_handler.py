@@ -5,15 +5,40 @@ Recebe eventos SNS do End User Messaging Social (mensagens do WhatsApp)
 e invoca o AgentCore Runtime orchestrator.
 """
 import boto3
+import functools
+import hashlib
 import json
+import logging
 import os
+import time
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Logs via logging (formatação preguiçosa); LOG_LEVEL=DEBUG inclui os payloads completos
+logger = logging.getLogger(__name__)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
 
 # Get AWS region from environment (with fallback)
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
 
+# Configuração comum dos clientes: conexões mantidas entre invocações do
+# container (keepalive) e retry adaptativo em caso de throttling
+CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
 # Initialize clients
-agent_core_client = boto3.client('bedrock-agentcore', region_name=AWS_REGION)
-cognito_client = boto3.client('cognito-idp', region_name=AWS_REGION)
+agent_core_client = boto3.client('bedrock-agentcore', region_name=AWS_REGION, config=CLIENT_CONFIG)
+cognito_client = boto3.client('cognito-idp', region_name=AWS_REGION, config=CLIENT_CONFIG)
+# Cliente do End User Messaging Social, criado na primeira confirmação de leitura
+socialmessaging_client = None
+
+# Threads para as chamadas que não dependem uma da outra (confirmação de
+# leitura e busca da persona), reaproveitadas entre invocações
+executor = ThreadPoolExecutor(max_workers=4)
 
 # Configuration from environment variables (required)
 AGENT_RUNTIME_ARN = os.environ.get('AGENT_RUNTIME_ARN')
@@ -28,15 +53,34 @@ WHATSAPP_PHONE_NUMBER_ID = os.environ.get('WHATSAPP_PHONE_NUMBER_ID')
 if not WHATSAPP_PHONE_NUMBER_ID:
     raise Exception("WHATSAPP_PHONE_NUMBER_ID environment variable is required")
 
+# Cache telefone -> (expira_em, persona), reaproveitado entre invocações do
+# mesmo container para que mensagens seguidas do mesmo usuário não consultem o Cognito
+PERSONA_CACHE_TTL_SECONDS = 3600
+PERSONA_CACHE_MAX_ENTRIES = 10000
+persona_cache = {}
+
+# Caracteres removidos do telefone para formar user_id/session ID ('+', '-' e espaço)
+PHONE_STRIP_TABLE = str.maketrans('', '', '+- ')
+
+# Encoder do payload do AgentCore, criado uma vez: JSON compacto (sem espaços)
+# e UTF-8 direto, sem escapar acentos como \uXXXX
+PAYLOAD_ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+def get_socialmessaging_client():
+    """
+    Retorna o cliente do End User Messaging Social, criando-o uma única vez por container
+    """
+    global socialmessaging_client
+    if socialmessaging_client is None:
+        socialmessaging_client = boto3.client('socialmessaging', region_name=AWS_REGION, config=CLIENT_CONFIG)
+    return socialmessaging_client
+
 def markAsRead(msg_id):
     """
     Marca mensagem como lida no WhatsApp
     """
     try:
-        print(f"📖 Marcando mensagem como lida: {msg_id}")
-        
-        # Inicializar cliente do End User Messaging Social
-        socialmessaging_client = boto3.client('socialmessaging', region_name=AWS_REGION)
+        logger.info("📖 Marcando mensagem como lida: %s", msg_id)
         
         # Preparar payload para marcar como lida
         meta_message = {
@@ -46,17 +90,17 @@ def markAsRead(msg_id):
         }
         
         # Enviar confirmação de leitura
-        response = socialmessaging_client.send_whatsapp_message(
+        response = get_socialmessaging_client().send_whatsapp_message(
             originationPhoneNumberId=WHATSAPP_PHONE_NUMBER_ID,
             metaApiVersion='v20.0',
             message=json.dumps(meta_message)
         )
         
-        print(f"✅ Mensagem marcada como lida: {msg_id}")
+        logger.info("✅ Mensagem marcada como lida: %s", msg_id)
         return response
         
     except Exception as e:
-        print(f"❌ Erro ao marcar mensagem como lida: {str(e)}")
+        logger.error("❌ Erro ao marcar mensagem como lida: %s", e)
         # Não falhar o processamento se não conseguir marcar como lida
         return None
 
@@ -76,43 +120,204 @@ def get_user_persona_by_phone(phone_number):
         if not phone_number.startswith('+'):
             phone_number = f'+{phone_number}'
         
-        print(f"🔍 Buscando usuário com telefone: {phone_number}")
+        # Usar a persona em cache enquanto não expirar
+        cached = persona_cache.get(phone_number)
+        if cached and cached[0] > time.monotonic():
+            logger.info("👤 Persona em cache para %s: %s", phone_number, cached[1])
+            return cached[1]
+        
+        logger.info("🔍 Buscando usuário com telefone: %s", phone_number)
         
-        # Listar todos os usuários da User Pool
-        # Nota: Para otimização em produção, considere usar filtros ou indexação
-        paginator = cognito_client.get_paginator('list_users')
+        # Filtrar pelo atributo phone_number no próprio Cognito (uma única
+        # chamada) em vez de percorrer todos os usuários da User Pool
+        users = cognito_client.list_users(
+            UserPoolId=USER_POOL_ID,
+            Filter=f'phone_number = "{phone_number}"',
+            Limit=1
+        )['Users']
         
-        for page in paginator.paginate(UserPoolId=USER_POOL_ID):
-            for user in page['Users']:
-                # Verificar se o usuário tem o atributo phone_number
-                phone_attr = None
-                persona_attr = None
-                
-                for attr in user.get('Attributes', []):
-                    if attr['Name'] == 'phone_number':
-                        phone_attr = attr['Value']
-                    elif attr['Name'] == 'custom:persona':
-                        persona_attr = attr['Value']
-                
-                # Comparar números de telefone
-                if phone_attr and phone_attr == phone_number:
-                    print(f"✅ Usuário encontrado: {user.get('Username', 'N/A')}")
-                    print(f"📱 Telefone: {phone_attr}")
-                    print(f"👤 Persona: {persona_attr}")
-                    
-                    # Retornar a persona encontrada ou 'student' como padrão
-                    return persona_attr if persona_attr else 'student'
+        if not users:
+            logger.warning("⚠️ Usuário não encontrado para o telefone: %s", phone_number)
+            return 'student'  # Persona padrão
         
-        print(f"⚠️ Usuário não encontrado para o telefone: {phone_number}")
-        return 'student'  # Persona padrão
+        user = users[0]
+        attributes = {attr['Name']: attr['Value'] for attr in user.get('Attributes', [])}
+        
+        # Usar a persona encontrada ou 'student' como padrão
+        persona = attributes.get('custom:persona') or 'student'
+        
+        logger.info(
+            "✅ Usuário encontrado: %s | 📱 Telefone: %s | 👤 Persona: %s",
+            user.get('Username', 'N/A'), phone_number, persona
+        )
+        
+        if len(persona_cache) >= PERSONA_CACHE_MAX_ENTRIES:
+            persona_cache.clear()
+        persona_cache[phone_number] = (time.monotonic() + PERSONA_CACHE_TTL_SECONDS, persona)
+        
+        return persona
         
     except Exception as e:
-        print(f"❌ Erro ao buscar usuário no Cognito: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erro ao buscar usuário no Cognito: %s", e)
         return 'student'  # Persona padrão em caso de erro
 
 
+@functools.lru_cache(maxsize=4096)
+def build_session_id(sender_phone, clean_phone, hour_timestamp):
+    """
+    Monta o session ID do AgentCore para o remetente na hora informada.
+    
+    Memorizado por (telefone, hora): mensagens seguidas do mesmo usuário na
+    mesma hora reaproveitam o ID sem recalcular o hash.
+    """
+    # Usar hash do número para manter consistência entre sessões do mesmo usuário
+    phone_hash = hashlib.sha256(sender_phone.encode()).hexdigest()
+    
+    return f"whatsapp-{clean_phone}-{hour_timestamp}-{phone_hash[:8]}"
+
+
+def parse_whatsapp_message(record):
+    """
+    Extrai a mensagem do WhatsApp de um record SNS do End User Messaging Social.
+    
+    Returns:
+        dict com message_id, sender_phone e user_message, ou None se o record
+        não contém mensagem (ex.: status update)
+    """
+    sns_message = json.loads(record['Sns']['Message'])
+    
+    # Payloads completos só com LOG_LEVEL=DEBUG
+    logger.debug("📨 SNS Message: %s", sns_message)
+    
+    # Extract WhatsApp webhook entry
+    whatsapp_entry_str = sns_message.get('whatsAppWebhookEntry', '{}')
+    whatsapp_entry = json.loads(whatsapp_entry_str)
+    
+    logger.debug("📱 WhatsApp Entry: %s", whatsapp_entry)
+    
+    # Extract message details
+    changes = whatsapp_entry.get('changes', [])
+    if not changes:
+        logger.warning("⚠️ Nenhuma mudança encontrada no evento")
+        return None
+    
+    value = changes[0].get('value', {})
+    
+    # Check if this is a message status update (skip these)
+    if 'statuses' in value:
+        logger.info("ℹ️ Status update recebido, ignorando...")
+        return None
+    
+    messages = value.get('messages', [])
+    
+    if not messages:
+        logger.warning("⚠️ Nenhuma mensagem encontrada no evento")
+        return None
+    
+    # Get first message
+    message = messages[0]
+    message_type = message.get('type', 'text')
+    sender_phone = message.get('from', '')
+    message_id = message.get('id', '')
+    
+    # Extract message content based on type
+    if message_type == 'text':
+        user_message = message.get('text', {}).get('body', '')
+    elif message_type == 'image':
+        user_message = "[Usuário enviou uma imagem]"
+    elif message_type == 'audio':
+        user_message = "[Usuário enviou um áudio]"
+    elif message_type == 'video':
+        user_message = "[Usuário enviou um vídeo]"
+    elif message_type == 'document':
+        user_message = "[Usuário enviou um documento]"
+    else:
+        user_message = f"[Usuário enviou {message_type}]"
+    
+    # Get contact info
+    contacts = value.get('contacts', [])
+    user_name = contacts[0].get('profile', {}).get('name', 'Usuário') if contacts else 'Usuário'
+    
+    logger.info("📱 Mensagem de: %s (%s) | 💬 Tipo: %s", user_name, sender_phone, message_type)
+    logger.info("💬 Conteúdo: %s", user_message)
+    
+    return {
+        "message_id": message_id,
+        "sender_phone": sender_phone,
+        "user_message": user_message
+    }
+
+
+def invoke_orchestrator(sender_phone, user_message, user_persona):
+    """
+    Invoca o AgentCore Runtime orchestrator com a mensagem do usuário.
+    
+    O runtime envia a resposta de volta ao WhatsApp pelo Gateway; o retorno
+    aqui é usado apenas para log.
+    """
+    # Confirmação de leitura já foi enviada via markAsRead()
+    # Não é necessário enviar mensagem de ACK adicional
+    # Generate session ID (use phone number as base for continuity)
+    # Session ID precisa ter no mínimo 33 caracteres
+    # Remove '+' do número pois AgentCore Memory não aceita
+    clean_phone = sender_phone.translate(PHONE_STRIP_TABLE)
+    
+    # Gerar timestamp por hora (YYYY-MM-DD-HH) para renovar sessão a cada hora
+    hour_timestamp = datetime.utcnow().strftime('%Y-%m-%d-%H')
+    
+    session_id = build_session_id(sender_phone, clean_phone, hour_timestamp)
+    
+    # Prepare payload for AgentCore Runtime
+    payload = PAYLOAD_ENCODER.encode({
+        "inputText": user_message,
+        "persona": user_persona,  # Persona obtida do Cognito
+        "user_id": clean_phone,  # Sem '+' para AgentCore Memory
+        "persona_id": clean_phone,
+        # O runtime envia a resposta para este número via Gateway
+        "whatsapp_phone_number": sender_phone  # Com '+' para enviar WhatsApp
+    }).encode('utf-8')
+    
+    logger.info(
+        "🚀 Invocando AgentCore Runtime... Agent ARN: %s | Session ID: %s",
+        AGENT_RUNTIME_ARN, session_id
+    )
+    
+    # Invoke AgentCore Runtime
+    response = agent_core_client.invoke_agent_runtime(
+        agentRuntimeArn=AGENT_RUNTIME_ARN,
+        runtimeSessionId=session_id,
+        payload=payload
+    )
+    
+    logger.info(
+        "✅ AgentCore Runtime invocado com sucesso (Content Type: %s)",
+        response.get('contentType', 'unknown')
+    )
+    
+    agent_response = None
+    
+    # Process streaming response
+    if "text/event-stream" in response.get("contentType", ""):
+        # Ler em blocos de 64 KiB e manter bytes; decodificar uma única vez no final
+        content = [
+            line[6:]
+            for line in response["response"].iter_lines(chunk_size=65536)
+            if line.startswith(b"data: ")
+        ]
+        
+        agent_response = b"\n".join(content).decode("utf-8")
+        logger.info("✅ Resposta do AgentCore (streaming): %.200s...", agent_response)
+        
+    elif response.get("contentType") == "application/json":
+        # json.loads aceita bytes UTF-8 diretamente
+        agent_response = json.loads(b''.join(response.get("response", [])))
+        logger.info("✅ Resposta do AgentCore (JSON): %s", agent_response)
+    
+    # O runtime já enviou a resposta de volta ao WhatsApp
+    # (tool send_whatsapp_message do Gateway)
+    return agent_response
+
+
 def lambda_handler(event, context):
     """
     Lambda function que recebe eventos SNS do End User Messaging Social
@@ -127,146 +332,36 @@ def lambda_handler(event, context):
         }]
     }
     """
-    print(f"📨 Evento SNS recebido")
-    print(f"📨 Número de records: {len(event.get('Records', []))}")
+    logger.info("📨 Evento SNS recebido com %s record(s)", len(event.get('Records', [])))
+    
+    # Confirmações de leitura em andamento; aguardadas antes de retornar,
+    # pois o container é congelado assim que o handler termina
+    read_receipts = []
     
     try:
         # Parse SNS message
         for record in event['Records']:
-            sns_message = json.loads(record['Sns']['Message'])
-            
-            print(f"📨 SNS Message: {json.dumps(sns_message, indent=2)}")
-            
-            # Extract WhatsApp webhook entry
-            whatsapp_entry_str = sns_message.get('whatsAppWebhookEntry', '{}')
-            whatsapp_entry = json.loads(whatsapp_entry_str)
-            
-            print(f"📱 WhatsApp Entry: {json.dumps(whatsapp_entry, indent=2)}")
-            
-            # Extract message details
-            changes = whatsapp_entry.get('changes', [])
-            if not changes:
-                print("⚠️ Nenhuma mudança encontrada no evento")
-                continue
-            
-            value = changes[0].get('value', {})
-            
-            # Check if this is a message status update (skip these)
-            if 'statuses' in value:
-                print("ℹ️ Status update recebido, ignorando...")
+            message = parse_whatsapp_message(record)
+            if message is None:
                 continue
             
-            messages = value.get('messages', [])
-            
-            if not messages:
-                print("⚠️ Nenhuma mensagem encontrada no evento")
-                continue
+            sender_phone = message["sender_phone"]
             
-            # Get first message
-            message = messages[0]
-            message_type = message.get('type', 'text')
-            sender_phone = message.get('from', '')
-            message_id = message.get('id', '')
+            # Marcar mensagem como lida e buscar a persona do usuário no Cognito
+            # em paralelo
+            read_receipts.append(executor.submit(markAsRead, message["message_id"]))
+            persona_future = executor.submit(get_user_persona_by_phone, sender_phone)
             
-            # Marcar mensagem como lida imediatamente
-            markAsRead(message_id)
-            
-            # Extract message content based on type
-            if message_type == 'text':
-                user_message = message.get('text', {}).get('body', '')
-            elif message_type == 'image':
-                user_message = "[Usuário enviou uma imagem]"
-            elif message_type == 'audio':
-                user_message = "[Usuário enviou um áudio]"
-            elif message_type == 'video':
-                user_message = "[Usuário enviou um vídeo]"
-            elif message_type == 'document':
-                user_message = "[Usuário enviou um documento]"
-            else:
-                user_message = f"[Usuário enviou {message_type}]"
-            
-            # Get contact info
-            contacts = value.get('contacts', [])
-            user_name = contacts[0].get('profile', {}).get('name', 'Usuário') if contacts else 'Usuário'
-            
-            print(f"📱 Mensagem de: {user_name} ({sender_phone})")
-            print(f"💬 Tipo: {message_type}")
-            print(f"💬 Conteúdo: {user_message}")
-            
-            # Buscar persona do usuário no Cognito
-            user_persona = get_user_persona_by_phone(sender_phone)
+            # Persona do usuário no Cognito
+            user_persona = persona_future.result()
             
             # Mapear "professor" para "teacher" para compatibilidade com AgentCore
             if user_persona == "professor":
                 user_persona = "teacher"
             
-            print(f"👤 Persona identificada: {user_persona}")
-            
-            # Confirmação de leitura já foi enviada via markAsRead()
-            # Não é necessário enviar mensagem de ACK adicional
-            # Generate session ID (use phone number as base for continuity)
-            # Session ID precisa ter no mínimo 33 caracteres
-            # Remove '+' do número pois AgentCore Memory não aceita
-            clean_phone = sender_phone.replace('+', '').replace('-', '').replace(' ', '')
+            logger.info("👤 Persona identificada: %s", user_persona)
             
-            # Usar hash do número para manter consistência entre sessões do mesmo usuário
-            import hashlib
-            from datetime import datetime
-            
-            phone_hash = hashlib.sha256(sender_phone.encode()).hexdigest()
-            
-            # Gerar timestamp por hora (YYYY-MM-DD-HH) para renovar sessão a cada hora
-            hour_timestamp = datetime.utcnow().strftime('%Y-%m-%d-%H')
-            
-            session_id = f"whatsapp-{clean_phone}-{hour_timestamp}-{phone_hash[:8]}"
-            
-            # Prepare payload for AgentCore Runtime
-            payload = json.dumps({
-                "inputText": user_message,
-                "persona": user_persona,  # Persona obtida do Cognito
-                "user_id": clean_phone,  # Sem '+' para AgentCore Memory
-                "persona_id": clean_phone,
-                # Adicionar contexto do WhatsApp para a tool send_whatsapp_message
-                "whatsapp_phone_number": sender_phone  # Com '+' para enviar WhatsApp
-            }).encode()
-            
-            print(f"🚀 Invocando AgentCore Runtime...")
-            print(f"   Agent ARN: {AGENT_RUNTIME_ARN}")
-            print(f"   Session ID: {session_id}")
-            
-            # Invoke AgentCore Runtime
-            response = agent_core_client.invoke_agent_runtime(
-                agentRuntimeArn=AGENT_RUNTIME_ARN,
-                runtimeSessionId=session_id,
-                payload=payload
-            )
-            
-            print(f"✅ AgentCore Runtime invocado com sucesso")
-            print(f"   Content Type: {response.get('contentType', 'unknown')}")
-            
-            # Process streaming response
-            if "text/event-stream" in response.get("contentType", ""):
-                content = []
-                for line in response["response"].iter_lines(chunk_size=10):
-                    if line:
-                        line = line.decode("utf-8")
-                        if line.startswith("data: "):
-                            line = line[6:]
-                            content.append(line)
-                
-                agent_response = "\n".join(content)
-                print(f"✅ Resposta do AgentCore (streaming): {agent_response[:200]}...")
-                
-            elif response.get("contentType") == "application/json":
-                content = []
-                for chunk in response.get("response", []):
-                    content.append(chunk.decode('utf-8'))
-                
-                agent_response = json.loads(''.join(content))
-                print(f"✅ Resposta do AgentCore (JSON): {agent_response}")
-            
-            # A resposta do agente já deve ter usado a tool send_whatsapp_message
-            # para enviar a mensagem de volta ao WhatsApp
+            invoke_orchestrator(sender_phone, message["user_message"], user_persona)
             
         return {
             'statusCode': 200,
@@ -277,9 +372,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"❌ Erro ao processar mensagem: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("❌ Erro ao processar mensagem: %s", e)
         
         return {
             'statusCode': 500,
@@ -288,3 +381,8 @@ def lambda_handler(event, context):
                 'error': str(e)
             })
         }
+    
+    finally:
+        # markAsRead trata os próprios erros; aqui só garantimos que terminou
+        for read_receipt in read_receipts:
+            read_receipt.result()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+# SPDX-License-Identifier: MIT-0
+
+"""
+Cache em disco das respostas do agente para os scripts de teste.
+
+Reexecutar um script com o mesmo prompt devolve a resposta gravada em
+.llm_cache/ (na raiz do repositório) em vez de invocar o modelo de novo.
+A chave é o SHA-256 dos campos que definem a requisição (ARN, payload,
+prompt...). Use --no-cache nos scripts, ou apague o diretório, para forçar
+uma nova chamada.
+
+Atenção: uma resposta vinda do cache não executa a invocação, então nenhum
+efeito colateral acontece (ex.: a mensagem de WhatsApp enviada pelo runtime).
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".llm_cache"
+
+
+def cache_key(key_fields: dict) -> str:
+    """SHA-256 determinístico (chaves ordenadas) dos campos da requisição."""
+    encoded = json.dumps(key_fields, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def cached_invoke(key_fields: dict, fn, enabled: bool = True):
+    """
+    Retorna (resultado, veio_do_cache).
+
+    Em cache miss chama fn() e grava o resultado, que precisa ser serializável
+    em JSON. Com enabled=False sempre chama fn() e não grava nada.
+    """
+    if not enabled:
+        return fn(), False
+
+    path = CACHE_DIR / f"{cache_key(key_fields)}.json"
+    try:
+        return json.loads(path.read_bytes()), True
+    except FileNotFoundError:
+        pass
+
+    result = fn()
+
+    # Gravar em arquivo temporário e renomear, para nunca deixar um JSON pela metade
+    CACHE_DIR.mkdir(exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+    tmp_path.replace(path)
+
+    return result, False
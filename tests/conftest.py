@@ -0,0 +1,16 @@
+"""
+Configuração do pytest para os testes unitários.
+
+Os módulos dos agentes são importados como no runtime (src/agents no
+sys.path) e utils a partir da raiz do repositório.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / "src" / "agents"))
+
+# Scripts manuais que chamam AWS ao serem importados; rode-os com python
+collect_ignore = ["test_tool.py", "invoke_agent.py", "invoke_agent_strands.py"]
@@ -9,6 +9,11 @@ Usage:
     python3 tests/invoke_agent.py
     python3 tests/invoke_agent.py --persona student --query "What are my pending tasks?"
     python3 tests/invoke_agent.py --persona professor --query "Show my course metrics"
+    python3 tests/invoke_agent.py --persona student,teacher,administrator
+    python3 tests/invoke_agent.py --no-cache
+
+Responses are cached in .llm_cache/ (see tests/_cache.py): repeating the same
+persona and query replays the stored response instead of invoking the runtime.
 
 Payload Parameters:
     - inputText (required): User's query
@@ -24,112 +29,182 @@ import json
 import uuid
 import argparse
 import os
+import traceback
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from _cache import cached_invoke
+
 # Load environment variables
 load_dotenv()
 
+PERSONA_CHOICES = ('student', 'teacher', 'professor', 'administrator')
+
+# Generate persona-specific user details
+PERSONA_CONFIGS = {
+    'student': {
+        'user_id': 'test_student_123',
+        'persona_id': 'STU-001',
+        'whatsapp_phone_number': '+5511123456789'
+    },
+    'teacher': {
+        'user_id': 'test_teacher_456', 
+        'persona_id': 'TEA-001',
+        'whatsapp_phone_number': '+551146731805'
+    },
+    'administrator': {
+        'user_id': 'test_admin_789',
+        'persona_id': 'ADM-001', 
+        'whatsapp_phone_number': '+5511987654321'
+    }
+}
+
+
+def parse_personas(value):
+    """Converte '--persona student,teacher' em uma lista de personas válidas."""
+    personas = [persona.strip() for persona in value.split(',') if persona.strip()]
+    invalid = [persona for persona in personas if persona not in PERSONA_CHOICES]
+    if not personas or invalid:
+        raise argparse.ArgumentTypeError(
+            f"invalid persona(s): {', '.join(invalid) or 'none given'} (choose from {', '.join(PERSONA_CHOICES)})"
+        )
+    return personas
+
+
+def invoke_persona(client, runtime_arn, persona, query, use_cache=True):
+    """
+    Invoca o runtime para uma persona e retorna (persona, session_id, resposta).
+    
+    session_id é None quando a resposta veio do cache em disco.
+    
+    As invocações de várias personas rodam em paralelo, por isso nada é
+    impresso aqui; main() mostra os resultados na ordem pedida.
+    """
+    # Map professor to teacher for compatibility
+    persona = 'teacher' if persona == 'professor' else persona
+    
+    # Gerar um session ID único (mínimo 33 caracteres)
+    session_id = str(uuid.uuid4()) + str(uuid.uuid4())[:5]
+    
+    config = PERSONA_CONFIGS[persona]
+    
+    # Preparar o payload com todos os parâmetros necessários
+    payload = json.dumps({
+        "inputText": query,
+        "persona": persona,
+        "user_id": config['user_id'],
+        "persona_id": config['persona_id'],
+        "whatsapp_phone_number": config['whatsapp_phone_number']
+    })
+    
+    def invoke():
+        # Invocar o agente
+        response = client.invoke_agent_runtime(
+            agentRuntimeArn=runtime_arn,
+            runtimeSessionId=session_id,
+            payload=payload,
+            qualifier="DEFAULT"
+        )
+        
+        # Ler a resposta
+        response_body = response['response'].read()
+        return json.loads(response_body)
+    
+    # O session ID é novo a cada execução, então fica fora da chave do cache
+    response_data, from_cache = cached_invoke(
+        {'arn': runtime_arn, 'qualifier': 'DEFAULT', 'payload': payload},
+        invoke,
+        enabled=use_cache
+    )
+    return persona, None if from_cache else session_id, response_data
+
+
+def print_error(e):
+    """Mostra o erro de uma invocação com os detalhes da AWS, se houver."""
+    print(f"❌ Erro ao invocar o agente: {str(e)}")
+    print(f"   Tipo: {type(e).__name__}")
+    
+    # Mostrar detalhes do erro se disponível
+    if hasattr(e, 'response'):
+        error_response = e.response
+        if 'Error' in error_response:
+            print(f"   Código: {error_response['Error'].get('Code', 'N/A')}")
+            print(f"   Mensagem: {error_response['Error'].get('Message', 'N/A')}")
+    
+    traceback.print_exception(e)
+
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Invoke AgentCore Runtime for testing')
     parser.add_argument('--persona', 
-                       choices=['student', 'teacher', 'professor', 'administrator'], 
-                       default='student',
-                       help='User persona (default: student)')
+                       type=parse_personas,
+                       default=['student'],
+                       help='User persona, or a comma-separated list invoked in parallel '
+                            f"({', '.join(PERSONA_CHOICES)}; default: student)")
     parser.add_argument('--query', 
                        default='Olá! Por favor, liste todas as ferramentas (tools) que você tem disponíveis para usar. Descreva cada uma delas brevemente.',
                        help='Query to send to the agent')
+    parser.add_argument('--no-cache',
+                       action='store_true',
+                       help='Always invoke the runtime instead of replaying responses from .llm_cache/')
     
     args = parser.parse_args()
     
-    # Map professor to teacher for compatibility
-    persona = 'teacher' if args.persona == 'professor' else args.persona
-    
     # Get runtime ARN from environment or use default
     RUNTIME_ARN = os.getenv('AGENT_RUNTIME_ARN', 'arn:aws:bedrock-agentcore:us-east-1:831782568328:runtime/Octank_edu_assistant-iGSP5IGDGF')
     REGION = os.getenv('AWS_REGION', 'us-east-1')
 
-    # Cliente do AgentCore
-    client = boto3.client('bedrock-agentcore', region_name=REGION)
+    # Cliente do AgentCore (thread-safe, compartilhado pelas invocações), com
+    # conexões suficientes para as personas em paralelo e retry adaptativo
+    client = boto3.client(
+        'bedrock-agentcore',
+        region_name=REGION,
+        config=Config(
+            max_pool_connections=32,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            tcp_keepalive=True
+        )
+    )
 
     print("🤖 Invocando o agente AgentCore...")
     print(f"📍 Runtime ARN: {RUNTIME_ARN}")
-    print(f"👤 Persona: {args.persona}")
+    print(f"👤 Persona: {', '.join(args.persona)}")
     print(f"💬 Query: {args.query}")
     print()
 
-    try:
-        # Gerar um session ID único (mínimo 33 caracteres)
-        session_id = str(uuid.uuid4()) + str(uuid.uuid4())[:5]
-        
-        print(f"🔑 Session ID: {session_id}")
-        print()
-        
-        # Generate persona-specific user details
-        persona_configs = {
-            'student': {
-                'user_id': 'test_student_123',
-                'persona_id': 'STU-001',
-                'whatsapp_phone_number': '+5511123456789'
-            },
-            'teacher': {
-                'user_id': 'test_teacher_456', 
-                'persona_id': 'TEA-001',
-                'whatsapp_phone_number': '+551146731805'
-            },
-            'administrator': {
-                'user_id': 'test_admin_789',
-                'persona_id': 'ADM-001', 
-                'whatsapp_phone_number': '+5511987654321'
-            }
-        }
-        
-        config = persona_configs[persona]
-        
-        # Preparar o payload com todos os parâmetros necessários
-        payload = json.dumps({
-            "inputText": args.query,
-            "persona": persona,
-            "user_id": config['user_id'],
-            "persona_id": config['persona_id'],
-            "whatsapp_phone_number": config['whatsapp_phone_number']
-        })
-        
-        # Invocar o agente
-        response = client.invoke_agent_runtime(
-            agentRuntimeArn=RUNTIME_ARN,
-            runtimeSessionId=session_id,
-            payload=payload,
-            qualifier="DEFAULT"
-        )
-        
-        print("✅ Resposta recebida!")
-        print("=" * 80)
-        
-        # Ler a resposta
-        response_body = response['response'].read()
-        response_data = json.loads(response_body)
-        
-        # Mostrar a resposta formatada
-        print(json.dumps(response_data, indent=2, ensure_ascii=False))
-        
-        print("=" * 80)
-        print()
-        print("✨ Invocação concluída com sucesso!")
-        
-    except Exception as e:
-        print(f"❌ Erro ao invocar o agente: {str(e)}")
-        print(f"   Tipo: {type(e).__name__}")
-        
-        # Mostrar detalhes do erro se disponível
-        if hasattr(e, 'response'):
-            error_response = e.response
-            if 'Error' in error_response:
-                print(f"   Código: {error_response['Error'].get('Code', 'N/A')}")
-                print(f"   Mensagem: {error_response['Error'].get('Message', 'N/A')}")
+    # Uma invocação por persona, em paralelo: o tempo total é o da mais lenta
+    with ThreadPoolExecutor(max_workers=len(args.persona)) as executor:
+        futures = [
+            executor.submit(invoke_persona, client, RUNTIME_ARN, persona, args.query, not args.no_cache)
+            for persona in args.persona
+        ]
         
-        import traceback
-        traceback.print_exc()
+        for requested_persona, future in zip(args.persona, futures):
+            try:
+                persona, session_id, response_data = future.result()
+            except Exception as e:
+                print(f"👤 Persona: {requested_persona}")
+                print_error(e)
+                print()
+                continue
+            
+            print(f"👤 Persona: {persona}")
+            if session_id is None:
+                print("♻️ Resposta do cache local (.llm_cache/); use --no-cache para invocar o runtime")
+            else:
+                print(f"🔑 Session ID: {session_id}")
+            print("✅ Resposta recebida!")
+            print("=" * 80)
+            
+            # Mostrar a resposta formatada
+            print(json.dumps(response_data, indent=2, ensure_ascii=False))
+            
+            print("=" * 80)
+            print()
+            print("✨ Invocação concluída com sucesso!")
+            print()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,9 @@
 from strands.models import BedrockModel
 from strands import Agent
 import logging
+import sys
+
+from _cache import cached_invoke
 
 # Configure logging
 logging.getLogger("strands").setLevel(logging.INFO)
@@ -11,6 +14,11 @@ logging.basicConfig(
 
 # Configuração do Runtime
 RUNTIME_ARN = "arn:aws:bedrock-agentcore:us-east-1:831782568328:runtime/Octank_edu_assistant-iGSP5IGDGF"
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+PROMPT = "Olá! Por favor, liste todas as ferramentas (tools) que você tem disponíveis para usar. Descreva cada uma delas."
+
+# Respostas repetidas vêm de .llm_cache/ (ver tests/_cache.py); --no-cache força a chamada
+USE_CACHE = "--no-cache" not in sys.argv[1:]
 
 print("🤖 Invocando o agente AgentCore via Strands...")
 print(f"📍 Runtime ARN: {RUNTIME_ARN}")
@@ -19,7 +27,7 @@ print()
 try:
     # Criar o modelo apontando para o runtime
     model = BedrockModel(
-        model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+        model_id=MODEL_ID,
         temperature=0.7,
     )
     
@@ -43,7 +51,13 @@ try:
     print("💬 Enviando mensagem ao agente...")
     print("=" * 80)
     
-    response = agent("Olá! Por favor, liste todas as ferramentas (tools) que você tem disponíveis para usar. Descreva cada uma delas.")
+    response, from_cache = cached_invoke(
+        {'runtime_arn': RUNTIME_ARN, 'model_id': MODEL_ID, 'prompt': PROMPT},
+        lambda: str(agent(PROMPT)),
+        enabled=USE_CACHE
+    )
+    if from_cache:
+        print("♻️ Resposta do cache local (.llm_cache/); use --no-cache para invocar o agente")
     
     print()
     print("=" * 80)
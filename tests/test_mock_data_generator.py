@@ -0,0 +1,19 @@
+"""Testes de src/agents/mock_data_generator.py."""
+
+import pytest
+from mock_data_generator import _month_label
+
+
+@pytest.mark.parametrize(
+    ("year", "month", "expected"),
+    [
+        (2025, 1, "January 2025"),
+        (2025, 12, "December 2025"),
+        (2025, 0, "December 2024"),
+        (2025, -1, "November 2024"),
+        (2025, -11, "January 2024"),
+        (2025, -12, "December 2023"),
+    ],
+)
+def test_month_label_crosses_year_boundaries(year, month, expected):
+    assert _month_label(year, month) == expected
@@ -0,0 +1,76 @@
+"""Testes do atalho de informações pessoais do orchestrator (respostas da memória)."""
+
+import json
+
+import pytest
+
+pytest.importorskip("bedrock_agentcore")
+pytest.importorskip("dotenv")
+pytest.importorskip("strands")
+
+from orchestrator_agentcore_runtime_gateway import answer_personal_info_from_memory  # noqa: E402
+
+
+class FakeMemoryClient:
+    """Devolve registros fixos por namespace e guarda as consultas feitas."""
+
+    def __init__(self, records_by_namespace):
+        self.records_by_namespace = records_by_namespace
+        self.calls = []
+
+    def retrieve_memories(self, memory_id, namespace, query, top_k):
+        self.calls.append(namespace)
+        return self.records_by_namespace.get(namespace, [])
+
+
+def record(text, score):
+    return {"content": {"text": text}, "score": score}
+
+
+@pytest.fixture
+def memory_client():
+    return FakeMemoryClient({
+        "/octank-edu/user-1/preferences": [
+            record(json.dumps({"context": "chat", "preference": "Likes studying math"}), 0.8),
+            record("Irrelevant", 0.2),
+        ],
+        "/octank-edu/user-1/facts": [
+            record("The user's name is Ana", 0.9),
+            record("Likes studying math", 0.75),
+        ],
+    })
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "What is my name and which courses am I failing?",
+        "Qual é o meu nome e quais são minhas tarefas?",
+        "Show my pending tasks",
+    ],
+)
+def test_longer_questions_go_to_the_orchestrator(memory_client, query):
+    assert answer_personal_info_from_memory(memory_client, "mem-1", "user-1", query) is None
+    assert memory_client.calls == []
+
+
+def test_answers_from_memory_best_match_first(memory_client):
+    answer = answer_personal_info_from_memory(memory_client, "mem-1", "user-1", "What's my name?")
+
+    assert answer == (
+        "Here is what I remember about you:\n"
+        "- The user's name is Ana\n"
+        "- Likes studying math"
+    )
+
+
+def test_answers_in_portuguese(memory_client):
+    answer = answer_personal_info_from_memory(memory_client, "mem-1", "user-1", "  Qual é o meu nome? ")
+
+    assert answer.startswith("Aqui está o que eu lembro sobre você:\n")
+
+
+def test_nothing_relevant_stored_goes_to_the_orchestrator():
+    memory_client = FakeMemoryClient({})
+
+    assert answer_personal_info_from_memory(memory_client, "mem-1", "user-1", "what is my name") is None
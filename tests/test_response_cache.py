@@ -0,0 +1,69 @@
+"""Testes do cache de respostas (src/agents/response_cache.py)."""
+
+import pytest
+import response_cache
+from response_cache import ResponseCache, normalize_query
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("What are my pending tasks?", "what are my pending tasks"),
+        ("  Show   my\tcourses !! ", "show my courses"),
+        ("LISTE OS CURSOS.", "liste os cursos"),
+        ("Straße?", "strasse"),
+    ],
+)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Relógio controlado no lugar de time.monotonic."""
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResponseCache(ttl_seconds=0, max_entries=10)
+    cache.put("key", "answer")
+    assert not cache.enabled
+    assert cache.get("key") is None
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    cache.put("key", "answer")
+
+    clock[0] += 59
+    assert cache.get("key") == "answer"
+
+    clock[0] += 1
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+
+    # Ler "a" o torna o mais recente; "b" sai quando "c" entra
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+
+    assert cache.get("a") == "A"
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+
+def test_put_replaces_and_refreshes_entry(clock):
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    cache.put("key", "old")
+
+    clock[0] += 50
+    cache.put("key", "new")
+
+    clock[0] += 50
+    assert cache.get("key") == "new"
@@ -0,0 +1,45 @@
+"""Testes das consultas de listagem do teacher assistant (atalho sem LLM)."""
+
+import pytest
+
+pytest.importorskip("strands")
+
+from response_cache import normalize_query  # noqa: E402
+from teacher_assistant_agent import (  # noqa: E402
+    _LIST_COURSES_RE,
+    _LIST_LOW_PERFORMERS_RE,
+    _LIST_TASKS_RE,
+)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "query"),
+    [
+        (_LIST_COURSES_RE, "Show my courses"),
+        (_LIST_COURSES_RE, "liste os meus cursos"),
+        (_LIST_TASKS_RE, "List all pending tasks?"),
+        (_LIST_TASKS_RE, "mostre as tarefas pendentes"),
+        (_LIST_LOW_PERFORMERS_RE, "show me the low-performing students"),
+        (_LIST_LOW_PERFORMERS_RE, "listar os alunos com notas baixas"),
+    ],
+)
+def test_listing_queries_match(pattern, query):
+    assert pattern.fullmatch(normalize_query(query))
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # Atrasadas é um subconjunto das pendentes; o atalho listaria todas
+        "Show overdue tasks",
+        "tarefas atrasadas",
+        "which of my courses have pending tasks",
+        "how many pending tasks do I have",
+    ],
+)
+def test_other_task_questions_go_to_the_agent(query):
+    normalized_query = normalize_query(query)
+    assert not any(
+        pattern.fullmatch(normalized_query)
+        for pattern in (_LIST_COURSES_RE, _LIST_TASKS_RE, _LIST_LOW_PERFORMERS_RE)
+    )
@@ -4,6 +4,9 @@ from strands.tools.mcp.mcp_client import MCPClient
 from strands import Agent
 import utils
 import logging
+import sys
+
+from _cache import cached_invoke
 
 # Configure logging
 logging.getLogger("strands").setLevel(logging.INFO)
@@ -12,6 +15,10 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
+# Respostas repetidas vêm de .llm_cache/ (ver tests/_cache.py); --no-cache força a chamada
+USE_CACHE = "--no-cache" not in sys.argv[1:]
+MODEL_ID = "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+
 # Get Cognito token
 token = utils.get_cognito_token()
 
@@ -25,7 +32,7 @@ client = MCPClient(create_streamable_http_transport)
 
 ## The IAM credentials configured in ~/.aws/credentials should have access to Bedrock model
 yourmodel = BedrockModel(
-    model_id="us.anthropic.claude-3-7-sonnet-20250219-v1:0",
+    model_id=MODEL_ID,
     temperature=0.7,
 )
 
@@ -37,10 +44,18 @@ with client:
     print(f"Tools loaded in the agent are {agent.tool_names}")
     #print(f"Tools configuration in the agent are {agent.tool_config}")
     # Invoke the agent with the sample prompt. This will only invoke  MCP listTools and retrieve the list of tools the LLM has access to. The below does not actually call any tool.
-    response1 = agent("Hi , can you list all tools available to you")
+    prompt1 = "Hi , can you list all tools available to you"
+    response1, from_cache = cached_invoke(
+        {'model_id': MODEL_ID, 'tools': sorted(agent.tool_names), 'prompt': prompt1},
+        lambda: str(agent(prompt1)),
+        enabled=USE_CACHE
+    )
+    if from_cache:
+        print("♻️ Response 1 from local cache (.llm_cache/); use --no-cache to call the model")
     print(f"\n=== Response 1 ===\n{response1}\n")
     
     # Invoke the agent with sample prompt, invoke the tool and display the response
+    # (never cached: the point is to actually send the WhatsApp message)
     response2 = agent("Envie uma mensagem WhatsApp para +551146731805 dizendo 'Olá! Esta é uma mensagem de teste do AgentCore Gateway.'")
     print(f"\n=== Response 2 ===\n{response2}\n")
     
@@ -0,0 +1,51 @@
+"""Testes de utils.update_env_vars."""
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("requests")
+
+import utils  # noqa: E402
+
+
+def test_missing_file_returns_false(tmp_path):
+    assert utils.update_env_vars(str(tmp_path / ".env"), {"KEY": "value"}) is False
+
+
+def test_replaces_existing_keys_and_appends_missing(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("# comentario\nGATEWAY_URL=old\nOTHER=keep\nMEMORY_ID = old\n")
+
+    assert utils.update_env_vars(str(env_file), {"GATEWAY_URL": "new", "MEMORY_ID": "mem-1", "KB_ID": "kb-1"})
+
+    assert env_file.read_text() == (
+        "# comentario\nGATEWAY_URL=new\nOTHER=keep\nMEMORY_ID=mem-1\nKB_ID=kb-1\n"
+    )
+    assert not (tmp_path / ".env.tmp").exists()
+
+
+def test_appends_after_file_without_trailing_newline(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("OTHER=keep")
+
+    assert utils.update_env_vars(str(env_file), {"KEY": "value"})
+
+    assert env_file.read_text() == "OTHER=keep\nKEY=value\n"
+
+
+def test_only_whole_keys_are_replaced(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("KEY_SUFFIX=keep\nPREFIX_KEY=keep\nKEY=old\n")
+
+    assert utils.update_env_vars(str(env_file), {"KEY": "new"})
+
+    assert env_file.read_text() == "KEY_SUFFIX=keep\nPREFIX_KEY=keep\nKEY=new\n"
+
+
+def test_values_are_written_literally(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("URL=old\n")
+
+    assert utils.update_env_vars(str(env_file), {"URL": r"https://example.com/\1?a=b"})
+
+    assert env_file.read_text() == "URL=https://example.com/\\1?a=b\n"
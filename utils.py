@@ -10,20 +10,25 @@ Amazon Bedrock AgentCore components including IAM roles, Cognito authentication,
 Lambda functions, and Gateway management.
 """
 
-import boto3
 import json
+import logging
+import os
+import re
+import threading
 import time
-from boto3.session import Session
+
+import boto3
 import botocore
 import requests
-import os
-import time
-from time import sleep
+
+import aws_clients
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
 
 
 def setup_cognito_user_pool():
-    boto_session = Session()
-    region = boto_session.region_name
+    region = aws_clients.region()
     
     # Initialize Cognito client
     cognito_client = boto3.client('cognito-idp', region_name=region)
@@ -80,10 +85,10 @@ def setup_cognito_user_pool():
         bearer_token = auth_response['AuthenticationResult']['AccessToken']
         
         # Output the required values
-        print(f"Pool id: {pool_id}")
-        print(f"Discovery URL: https://cognito-idp.{region}.amazonaws.com/{pool_id}/.well-known/openid-configuration")
-        print(f"Client ID: {client_id}")
-        print(f"Bearer Token: {bearer_token}")
+        logger.info("Pool id: %s", pool_id)
+        logger.info("Discovery URL: https://cognito-idp.%s.amazonaws.com/%s/.well-known/openid-configuration", region, pool_id)
+        logger.info("Client ID: %s", client_id)
+        logger.info("Bearer Token: %s", bearer_token)
         
         # Return values if needed for further processing
         return {
@@ -94,21 +99,60 @@ def setup_cognito_user_pool():
         }
         
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error("Error: %s", e)
         return None
 
+# SSM values are reused for this long; long-running processes (the AgentCore
+# runtime) then pick up rotated or redeployed parameters within the TTL
+SSM_PARAMETER_TTL_SECONDS = 300
+# (name, with_decryption) -> (monotonic expiry time, value)
+_ssm_parameter_cache = {}
+_ssm_parameter_lock = threading.Lock()
+
+
 def get_ssm_parameter(name: str, with_decryption: bool = True) -> str:
-    ssm = boto3.client("ssm")
+    """
+    Read an SSM parameter, reusing the value for SSM_PARAMETER_TTL_SECONDS.
+
+    put_ssm_parameter drops the cached value, so a value written by this
+    process is re-read on the next call.
+    """
+    key = (name, with_decryption)
+    with _ssm_parameter_lock:
+        cached = _ssm_parameter_cache.get(key)
+    if cached and time.monotonic() < cached[0]:
+        return cached[1]
+
+    ssm = aws_clients.client("ssm")
 
     response = ssm.get_parameter(Name=name, WithDecryption=with_decryption)
+    value = response["Parameter"]["Value"]
+
+    with _ssm_parameter_lock:
+        _ssm_parameter_cache[key] = (time.monotonic() + SSM_PARAMETER_TTL_SECONDS, value)
+    return value
+
+
+def get_ssm_parameters(names: list, with_decryption: bool = True) -> dict:
+    """
+    Read several SSM parameters with a single GetParameters call (max 10 names).
 
-    return response["Parameter"]["Value"]
+    Returns a {name: value} dict; raises KeyError naming any parameter that
+    does not exist, like get_ssm_parameter would fail on it.
+    """
+    ssm = aws_clients.client("ssm")
+
+    response = ssm.get_parameters(Names=list(names), WithDecryption=with_decryption)
+    if response["InvalidParameters"]:
+        raise KeyError(f"SSM parameters not found: {response['InvalidParameters']}")
+
+    return {parameter["Name"]: parameter["Value"] for parameter in response["Parameters"]}
 
 
 def put_ssm_parameter(
     name: str, value: str, parameter_type: str = "String", with_encryption: bool = False
 ) -> None:
-    ssm = boto3.client("ssm")
+    ssm = aws_clients.client("ssm")
 
     put_params = {
         "Name": name,
@@ -121,6 +165,62 @@ def put_ssm_parameter(
         put_params["Type"] = "SecureString"
 
     ssm.put_parameter(**put_params)
+    with _ssm_parameter_lock:
+        _ssm_parameter_cache.pop((name, True), None)
+        _ssm_parameter_cache.pop((name, False), None)
+
+
+def submit_ssm_parameters(executor, parameters: dict) -> list:
+    """
+    Queue SSM parameter writes on an existing executor without waiting.
+
+    Returns the futures so the caller can join them (and surface errors) once
+    the work it wanted to overlap with the writes is done.
+    """
+    # Build the SSM client here, before the workers need it: creating clients
+    # from the shared boto3 Session is not thread-safe
+    aws_clients.client("ssm")
+    return [executor.submit(put_ssm_parameter, name, value) for name, value in parameters.items()]
+
+def update_env_vars(path: str, updates: dict) -> bool:
+    """
+    Set KEY=value entries in a .env file in a single read/write pass.
+
+    Existing keys are replaced in place with one multiline regex substitution
+    and missing keys are appended. The file is written to a temporary sibling
+    and moved over the original with os.replace, so a crash never leaves a
+    half-written .env behind. Returns False if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return False
+    if not updates:
+        return True
+
+    with open(path, 'r') as f:
+        content = f.read()
+
+    pattern = re.compile(
+        r'^(' + '|'.join(re.escape(key) for key in updates) + r')[ \t]*=.*$', re.MULTILINE
+    )
+    seen = set()
+
+    def _replace(match):
+        key = match.group(1)
+        seen.add(key)
+        return f"{key}={updates[key]}"
+
+    content = pattern.sub(_replace, content)
+    missing = [f"{key}={value}" for key, value in updates.items() if key not in seen]
+    if missing:
+        if content and not content.endswith('\n'):
+            content += '\n'
+        content += '\n'.join(missing) + '\n'
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
 
 def get_or_create_user_pool(cognito, USER_POOL_NAME):
     response = cognito.list_user_pools(MaxResults=60)
@@ -138,11 +238,11 @@ def get_or_create_user_pool(cognito, USER_POOL_NAME):
             if domain:
                 region = user_pool_id.split('_')[0] if '_' in user_pool_id else REGION
                 domain_url = f"https://{domain}.auth.{region}.amazoncognito.com"
-                print(f"Found domain for user pool {user_pool_id}: {domain} ({domain_url})")
+                logger.info("Found domain for user pool %s: %s (%s)", user_pool_id, domain, domain_url)
             else:
-                print(f"No domains found for user pool {user_pool_id}")
+                logger.info("No domains found for user pool %s", user_pool_id)
             return pool["Id"]
-    print('Creating new user pool')
+    logger.info("Creating new user pool")
     created = cognito.create_user_pool(PoolName=USER_POOL_NAME)
     user_pool_id = created["UserPool"]["Id"]
     user_pool_id_without_underscore_lc = user_pool_id.replace("_", "").lower()
@@ -150,7 +250,7 @@ def get_or_create_user_pool(cognito, USER_POOL_NAME):
         Domain=user_pool_id_without_underscore_lc,
         UserPoolId=user_pool_id
     )
-    print("Domain created as well")
+    logger.info("Domain created as well")
     return created["UserPool"]["Id"]
 
 def get_or_create_resource_server(cognito, user_pool_id, RESOURCE_SERVER_ID, RESOURCE_SERVER_NAME, SCOPES):
@@ -161,7 +261,7 @@ def get_or_create_resource_server(cognito, user_pool_id, RESOURCE_SERVER_ID, RES
         )
         return RESOURCE_SERVER_ID
     except cognito.exceptions.ResourceNotFoundException:
-        print('creating new resource server')
+        logger.info("creating new resource server")
         cognito.create_resource_server(
             UserPoolId=user_pool_id,
             Identifier=RESOURCE_SERVER_ID,
@@ -176,7 +276,7 @@ def get_or_create_m2m_client(cognito, user_pool_id, CLIENT_NAME, RESOURCE_SERVER
         if client["ClientName"] == CLIENT_NAME:
             describe = cognito.describe_user_pool_client(UserPoolId=user_pool_id, ClientId=client["ClientId"])
             return client["ClientId"], describe["UserPoolClient"]["ClientSecret"]
-    print('creating new m2m client')
+    logger.info("creating new m2m client")
     created = cognito.create_user_pool_client(
         UserPoolId=user_pool_id,
         ClientName=CLIENT_NAME,
@@ -201,8 +301,6 @@ def get_token(user_pool_id: str, client_id: str, client_secret: str, scope_strin
             "scope": scope_string,
 
         }
-        print(client_id)
-        print(client_secret)
         response = requests.post(url, headers=headers, data=data)
         response.raise_for_status()
         return response.json()
@@ -210,33 +308,49 @@ def get_token(user_pool_id: str, client_id: str, client_secret: str, scope_strin
     except requests.exceptions.RequestException as err:
         return {"error": str(err)}
 
+# Token do Cognito em cache: {"token": str, "expires_at": float}
+_cognito_token_cache = {}
+_cognito_token_lock = threading.Lock()
+# Renova o token este número de segundos antes de expirar
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+
+
 def get_cognito_token() -> str:
     """
     Obtém o token de acesso do Cognito usando os parâmetros armazenados no SSM
+
+    O token fica em cache até TOKEN_REFRESH_MARGIN_SECONDS antes do expires_in
+    retornado pelo Cognito, então chamadas repetidas não refazem o fluxo OAuth.
     """
-    boto_session = Session()
-    region = boto_session.region_name
-    
-    # Recupera os parâmetros do SSM
-    user_pool_id = get_ssm_parameter("/app/octank/agentcore/user_pool_id")
-    client_id = get_ssm_parameter("/app/octank/agentcore/client_id")
-    client_secret = get_ssm_parameter("/app/octank/agentcore/client_secret")
-    scope_string = get_ssm_parameter("/app/octank/agentcore/scope")
-    
-    # Obtém o token
-    token_response = get_token(user_pool_id, client_id, client_secret, scope_string, region)
-    
-    if "error" in token_response:
-        raise Exception(f"Erro ao obter token: {token_response['error']}")
-    
-    return token_response["access_token"]
+    with _cognito_token_lock:
+        if time.time() < _cognito_token_cache.get("expires_at", 0):
+            return _cognito_token_cache["token"]
+
+        region = aws_clients.region()
+        
+        # Recupera os parâmetros do SSM
+        user_pool_id = get_ssm_parameter("/app/octank/agentcore/user_pool_id")
+        client_id = get_ssm_parameter("/app/octank/agentcore/client_id")
+        client_secret = get_ssm_parameter("/app/octank/agentcore/client_secret")
+        scope_string = get_ssm_parameter("/app/octank/agentcore/scope")
+        
+        # Obtém o token
+        token_response = get_token(user_pool_id, client_id, client_secret, scope_string, region)
+        
+        if "error" in token_response:
+            raise Exception(f"Erro ao obter token: {token_response['error']}")
+        
+        _cognito_token_cache["token"] = token_response["access_token"]
+        _cognito_token_cache["expires_at"] = (
+            time.time() + token_response.get("expires_in", 3600) - TOKEN_REFRESH_MARGIN_SECONDS
+        )
+        return _cognito_token_cache["token"]
     
 def create_agentcore_role(agent_name):
     iam_client = boto3.client('iam')
     agentcore_role_name = f'agentcore-{agent_name}-role'
-    boto_session = Session()
-    region = boto_session.region_name
-    account_id = boto3.client("sts").get_caller_identity()["Account"]
+    region = aws_clients.region()
+    account_id = aws_clients.account_id()
     role_policy = {
         "Version": "2012-10-17",
         "Statement": [
@@ -428,7 +542,7 @@ def create_agentcore_role(agent_name):
         )
 
         # Wait for role to be available using waiter
-        print(f"⏳ Waiting for IAM role to be ready: {agentcore_role_name}")
+        logger.info("⏳ Waiting for IAM role to be ready: %s", agentcore_role_name)
         waiter = iam_client.get_waiter('role_exists')
         waiter.wait(
             RoleName=agentcore_role_name,
@@ -437,19 +551,19 @@ def create_agentcore_role(agent_name):
                 'MaxAttempts': 30  # Max 60 seconds total
             }
         )
-        print(f"✅ IAM role is ready: {agentcore_role_name}")
+        logger.info("✅ IAM role is ready: %s", agentcore_role_name)
         
         # Additional wait for eventual consistency
-        print("⏳ Waiting for IAM eventual consistency...")
+        logger.info("⏳ Waiting for IAM eventual consistency...")
         time.sleep(30)  # Increased from 15 to 30 seconds
         
     except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists")
+        logger.info("Role already exists")
         return iam_client.get_role(RoleName=agentcore_role_name)
         
 
     # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_role_name}")
+    logger.info("attaching role policy %s", agentcore_role_name)
     try:
         iam_client.put_role_policy(
             PolicyDocument=role_policy_document,
@@ -457,16 +571,15 @@ def create_agentcore_role(agent_name):
             RoleName=agentcore_role_name
         )
     except Exception as e:
-        print(e)
+        logger.error("%s", e)
 
     return agentcore_iam_role
 
 def create_agentcore_gateway_role(gateway_name):
     iam_client = boto3.client('iam')
     agentcore_gateway_role_name = f'agentcore-{gateway_name}-role'
-    boto_session = Session()
-    region = boto_session.region_name
-    account_id = boto3.client("sts").get_caller_identity()["Account"]
+    region = aws_clients.region()
+    account_id = aws_clients.account_id()
     role_policy = {
         "Version": "2012-10-17",
         "Statement": [{
@@ -520,7 +633,7 @@ def create_agentcore_gateway_role(gateway_name):
         )
 
         # Wait for role to be available using waiter
-        print(f"⏳ Waiting for IAM gateway role to be ready: {agentcore_gateway_role_name}")
+        logger.info("⏳ Waiting for IAM gateway role to be ready: %s", agentcore_gateway_role_name)
         waiter = iam_client.get_waiter('role_exists')
         waiter.wait(
             RoleName=agentcore_gateway_role_name,
@@ -529,17 +642,17 @@ def create_agentcore_gateway_role(gateway_name):
                 'MaxAttempts': 30  # Max 60 seconds total
             }
         )
-        print(f"✅ IAM gateway role is ready: {agentcore_gateway_role_name}")
+        logger.info("✅ IAM gateway role is ready: %s", agentcore_gateway_role_name)
         
         # Additional wait for eventual consistency
-        print("⏳ Waiting for IAM eventual consistency...")
+        logger.info("⏳ Waiting for IAM eventual consistency...")
         time.sleep(30)  # Increased from 15 to 30 seconds
     except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists ")
+        logger.info("Role already exists")
         return iam_client.get_role(RoleName=agentcore_gateway_role_name)
 
     # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_gateway_role_name}")
+    logger.info("attaching role policy %s", agentcore_gateway_role_name)
     try:
         iam_client.put_role_policy(
             PolicyDocument=role_policy_document,
@@ -547,7 +660,7 @@ def create_agentcore_gateway_role(gateway_name):
             RoleName=agentcore_gateway_role_name
         )
     except Exception as e:
-        print(e)
+        logger.error("%s", e)
 
     return agentcore_iam_role
 
@@ -555,9 +668,8 @@ def create_agentcore_gateway_role(gateway_name):
 def create_agentcore_gateway_role_s3_smithy(gateway_name):
     iam_client = boto3.client('iam')
     agentcore_gateway_role_name = f'agentcore-{gateway_name}-role'
-    boto_session = Session()
-    region = boto_session.region_name
-    account_id = boto3.client("sts").get_caller_identity()["Account"]
+    region = aws_clients.region()
+    account_id = aws_clients.account_id()
     role_policy = {
         "Version": "2012-10-17",
         "Statement": [{
@@ -612,7 +724,7 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
         )
 
         # Wait for role to be available using waiter
-        print(f"⏳ Waiting for IAM lambda role to be ready: {agentcore_gateway_role_name}")
+        logger.info("⏳ Waiting for IAM lambda role to be ready: %s", agentcore_gateway_role_name)
         waiter = iam_client.get_waiter('role_exists')
         waiter.wait(
             RoleName=agentcore_gateway_role_name,
@@ -621,17 +733,17 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
                 'MaxAttempts': 30  # Max 60 seconds total
             }
         )
-        print(f"✅ IAM lambda role is ready: {agentcore_gateway_role_name}")
+        logger.info("✅ IAM lambda role is ready: %s", agentcore_gateway_role_name)
         
         # Additional wait for eventual consistency
-        print("⏳ Waiting for IAM eventual consistency...")
+        logger.info("⏳ Waiting for IAM eventual consistency...")
         time.sleep(30)  # Increased from 15 to 30 seconds
     except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists")
+        logger.info("Role already exists")
         return iam_client.get_role(RoleName=agentcore_gateway_role_name)
 
     # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_gateway_role_name}")
+    logger.info("attaching role policy %s", agentcore_gateway_role_name)
     try:
         iam_client.put_role_policy(
             PolicyDocument=role_policy_document,
@@ -639,30 +751,34 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
             RoleName=agentcore_gateway_role_name
         )
     except Exception as e:
-        print(e)
+        logger.error("%s", e)
 
     return agentcore_iam_role
 
-def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
-    boto_session = Session()
-    region = boto_session.region_name
+def create_gateway_lambda(lambda_function_code) -> dict[str, int]:
+    """
+    Create the gateway Lambda. lambda_function_code is either the ZIP bytes or a
+    path to the ZIP file on disk.
+    """
+    region = aws_clients.region()
 
     return_resp = {"lambda_function_arn": "Pending", "exit_code": 1}
     
     # Initialize Cognito client
-    lambda_client = boto3.client('lambda', region_name=region)
-    iam_client = boto3.client('iam', region_name=region)
+    lambda_client = aws_clients.client('lambda', region)
+    iam_client = aws_clients.client('iam', region)
 
     role_name = 'gateway_lambda_iamrole'
     role_arn = ''
     lambda_function_name = 'send_message_tool'
 
-    print("Reading code from zip file")
-    with open(lambda_function_code_path, 'rb') as f:
-        lambda_function_code = f.read()
+    if not isinstance(lambda_function_code, (bytes, bytearray)):
+        logger.info("Reading code from zip file")
+        with open(lambda_function_code, 'rb') as f:
+            lambda_function_code = f.read()
 
     try:
-        print("Creating IAM role for lambda function")
+        logger.info("Creating IAM role for lambda function")
 
         response = iam_client.create_role(
             RoleName=role_name,
@@ -683,27 +799,27 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
 
         role_arn = response['Role']['Arn']
 
-        print("Attaching policy to the IAM role")
+        logger.info("Attaching policy to the IAM role")
 
         response = iam_client.attach_role_policy(
             RoleName=role_name,
             PolicyArn='arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole'
         )
 
-        print(f"Role '{role_name}' created successfully: {role_arn}")
+        logger.info("Role '%s' created successfully: %s", role_name, role_arn)
     except botocore.exceptions.ClientError as error:
         if error.response['Error']['Code'] == "EntityAlreadyExists":
             response = iam_client.get_role(RoleName=role_name)
             role_arn = response['Role']['Arn']
-            print(f"IAM role {role_name} already exists. Using the same ARN {role_arn}")
+            logger.info("IAM role %s already exists. Using the same ARN %s", role_name, role_arn)
         else:
             error_message = error.response['Error']['Code'] + "-" + error.response['Error']['Message']
-            print(f"Error creating role: {error_message}")
+            logger.error("Error creating role: %s", error_message)
             return_resp['lambda_function_arn'] = error_message
 
     # Wait for role to be available using waiter
     if role_arn != "":
-        print("⏳ Waiting for Lambda IAM role to be ready...")
+        logger.info("⏳ Waiting for Lambda IAM role to be ready...")
         waiter = iam_client.get_waiter('role_exists')
         waiter.wait(
             RoleName=role_name,
@@ -712,13 +828,13 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
                 'MaxAttempts': 30  # Max 60 seconds total
             }
         )
-        print(f"✅ Lambda IAM role is ready: {role_name}")
+        logger.info("✅ Lambda IAM role is ready: %s", role_name)
         
         # Additional wait for eventual consistency
-        print("⏳ Waiting for IAM eventual consistency...")
+        logger.info("⏳ Waiting for IAM eventual consistency...")
         time.sleep(10)
         
-        print("Creating lambda function")
+        logger.info("Creating lambda function")
         # Create lambda function    
         try:
             lambda_response = lambda_client.create_function(
@@ -737,29 +853,29 @@ def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
             if error.response['Error']['Code'] == "ResourceConflictException":
                 response = lambda_client.get_function(FunctionName=lambda_function_name)
                 lambda_arn = response['Configuration']['FunctionArn']
-                print(f"AWS Lambda function {lambda_function_name} already exists. Using the same ARN {lambda_arn}")
+                logger.info("AWS Lambda function %s already exists. Using the same ARN %s", lambda_function_name, lambda_arn)
                 return_resp['lambda_function_arn'] = lambda_arn
             else:
                 error_message = error.response['Error']['Code'] + "-" + error.response['Error']['Message']
-                print(f"Error creating lambda function: {error_message}")
+                logger.error("Error creating lambda function: %s", error_message)
                 return_resp['lambda_function_arn'] = error_message
 
     return return_resp
 
 def delete_gateway(gateway_client,gatewayId): 
-    print("Deleting all targets for gateway", gatewayId)
+    logger.info("Deleting all targets for gateway %s", gatewayId)
     list_response = gateway_client.list_gateway_targets(
             gatewayIdentifier = gatewayId,
             maxResults=100
     )
     for item in list_response['items']:
         targetId = item["targetId"]
-        print("Deleting target ", targetId)
+        logger.info("Deleting target %s", targetId)
         gateway_client.delete_gateway_target(
             gatewayIdentifier = gatewayId,
             targetId = targetId
         )
-    print("Deleting gateway ", gatewayId)
+    logger.info("Deleting gateway %s", gatewayId)
     gateway_client.delete_gateway(gatewayIdentifier = gatewayId)
 
 def delete_all_gateways(gateway_client):
@@ -771,4 +887,4 @@ def delete_all_gateways(gateway_client):
             gatewayId= item["gatewayId"]
             delete_gateway(gatewayId)
     except Exception as e:
-        print(e)
+        logger.error("%s", e)